@@ -1,12 +1,17 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from expenses import assets
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('expenses.urls')),  # This includes all your app URLs
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.EXPENSES_SERVE_STATIC:
+    urlpatterns += [re_path(rf'^{settings.STATIC_URL.strip("/")}/(?P<path>.+)$', assets.serve)]
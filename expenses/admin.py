@@ -1,21 +1,109 @@
+from datetime import date
+
 from django.contrib import admin
-from .models import Transaction, Category, Budget
+from django.utils import formats
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+from . import search
+from .models import Transaction, Category, Budget, MonthlyRollup
+from .pagination import EstimatedCountPaginator
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables with millions of rows.
+
+    The changelist never counts the whole table (EstimatedCountPaginator,
+    no full result count). Subclasses join related rows into the page query
+    with ``list_select_related`` and pick foreign keys by autocomplete or raw
+    id instead of a <select> listing every row.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+def rollup_date_hierarchy(cl):
+    """The year and month choices of the Transaction date_hierarchy, read from MonthlyRollup.
 
-class TransactionAdmin(admin.ModelAdmin):
+    Django lists them with a DISTINCT over every matching transaction; the
+    rollups know which months have any in a fraction of the rows. Other
+    changelist filters are not applied, so a listed month may turn out empty.
+    Returns None at the day level (one month of txn_date_id_idx), which
+    Django's own tag renders.
+    """
+    if 'date__day' in cl.params or 'date__month' in cl.params:
+        return None
+
+    def link(filters):
+        return cl.get_query_string(filters, ['date__'])
+
+    year = cl.params.get('date__year')
+    rollups = MonthlyRollup.objects.order_by()
+    if year is None:
+        years = sorted(set(rollups.values_list('year', flat=True).distinct()))
+        if len(years) != 1:
+            return {
+                'back': None,
+                'choices': [{'link': link({'date__year': str(value)}), 'title': str(value)} for value in years],
+            }
+        year, back = years[0], None
+    else:
+        back = {'link': link({}), 'title': _('All dates')}
+    try:
+        months = sorted(set(rollups.filter(year=int(year)).values_list('month', flat=True).distinct()))
+    except ValueError:
+        return None
+    if back is None and len(months) == 1:
+        return None
+    return {
+        'back': back,
+        'choices': [
+            {
+                'link': link({'date__year': year, 'date__month': month}),
+                'title': capfirst(formats.date_format(date(int(year), month, 1), 'YEAR_MONTH_FORMAT')),
+            }
+            for month in months
+        ],
+    }
+
+class TransactionAdmin(LargeTableAdmin):
     list_display = ('user', 'amount', 'category', 'date', 'transaction_type')
-    list_filter = ('transaction_type', 'date', 'category')
-    search_fields = ('description', 'category__name')
+    list_filter = ('transaction_type', 'recurring')
+    list_select_related = ('user', 'category')
+    autocomplete_fields = ('user', 'category')
+    raw_id_fields = ('recurrence_source',)
+    date_hierarchy = 'date'
+    # Other columns would sort the whole table
+    sortable_by = ('date',)
+    search_fields = ('description',)
+    search_help_text = 'Words of the description starting with the search terms.'
+
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index instead of a joined icontains over every row
+        if not search_term.strip():
+            return queryset, False
+        return search.prefix_filter(queryset, search_term), False
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        cl = getattr(response, 'context_data', None) and response.context_data.get('cl')
+        if cl is not None:
+            response.context_data['rollup_date_hierarchy'] = rollup_date_hierarchy(cl)
+        return response
 
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(LargeTableAdmin):
     list_display = ('name', 'user', 'is_default')
     list_filter = ('is_default',)
-    search_fields = ('name',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    search_fields = ('^name',)
 
-class BudgetAdmin(admin.ModelAdmin):
-    list_display = ('user', 'category', 'amount', 'start_date', 'end_date', 'is_active')
+class BudgetAdmin(LargeTableAdmin):
+    list_display = ('user', 'category', 'amount', 'spent', 'start_date', 'end_date', 'is_active')
     list_filter = ('is_active', 'start_date', 'end_date')
-    search_fields = ('category__name',)
+    list_select_related = ('user', 'category')
+    autocomplete_fields = ('user', 'category')
+    readonly_fields = ('spent', 'transaction_count')
+    search_fields = ('=user__username', '^category__name')
 
 admin.site.register(Transaction, TransactionAdmin)
 admin.site.register(Category, CategoryAdmin)
-admin.site.register(Budget, BudgetAdmin)
\ No newline at end of file
+admin.site.register(Budget, BudgetAdmin)
@@ -0,0 +1,178 @@
+from math import ceil
+
+import numpy as np
+from django.db.models import Sum
+
+from .categories import categories_for
+from .models import Transaction
+
+UNCATEGORIZED = 'Uncategorized'
+
+# One row per (day, type, category) group of the range; category 0 is "none"
+ROW_DTYPE = np.dtype([('day', 'i4'), ('income', '?'), ('category', 'i8'), ('amount', 'f8')])
+
+
+def fetch(user, start_date, end_date):
+    """Daily totals per type and category of ``user``'s transactions in the range.
+
+    The database sums each (date, type, category) group, so the array holds at
+    most days x categories x 2 rows however many transactions there are; the
+    txn_user_date_report_idx index covers the query. ``day`` counts from
+    ``start_date``.
+    """
+    rows = (
+        Transaction.objects.for_user(user).filter(date__range=[start_date, end_date]).order_by()
+        .values_list('date', 'transaction_type', 'category_id').annotate(total=Sum('amount'))
+    )
+    origin = start_date.toordinal()
+    return np.fromiter(
+        (
+            (day.toordinal() - origin, transaction_type == Transaction.INCOME, category_id or 0, total)
+            for day, transaction_type, category_id, total in rows.iterator()
+        ),
+        dtype=ROW_DTYPE,
+    )
+
+
+def _amounts(values):
+    return np.round(values, 2).tolist()
+
+
+def _by_type(rows, index, size):
+    """Sum income and expenses into ``size`` slots by the per-row slot ``index``."""
+    income = np.bincount(index, weights=np.where(rows['income'], rows['amount'], 0), minlength=size)
+    expenses = np.bincount(index, weights=np.where(rows['income'], 0, rows['amount']), minlength=size)
+    return _amounts(income), _amounts(expenses)
+
+
+def daily_series(rows, start_date, end_date, max_points):
+    """Income and expenses per day, or per ``bucket_days``-day bucket for long ranges.
+
+    Buckets start at ``start_date``; ``labels`` are each bucket's first day.
+    """
+    days = (end_date - start_date).days + 1
+    bucket_days = max(1, ceil(days / max_points))
+    buckets = ceil(days / bucket_days)
+    income, expenses = _by_type(rows, rows['day'] // bucket_days, buckets)
+    first = np.datetime64(start_date, 'D')
+    return {
+        'bucket_days': bucket_days,
+        'labels': np.datetime_as_string(first + np.arange(buckets) * bucket_days).tolist(),
+        'income': income,
+        'expenses': expenses,
+    }
+
+
+def monthly_series(rows, start_date, end_date):
+    """Income and expenses per calendar month touched by the range."""
+    first = np.datetime64(start_date, 'M')
+    months = (np.datetime64(end_date, 'M') - first).astype(int) + 1
+    index = ((np.datetime64(start_date, 'D') + rows['day']).astype('datetime64[M]') - first).astype(int)
+    income, expenses = _by_type(rows, index, months)
+    return {
+        'labels': np.datetime_as_string(first + np.arange(months)).tolist(),
+        'income': income,
+        'expenses': expenses,
+    }
+
+
+def category_series(rows, names):
+    """Expense totals per category, largest first."""
+    expenses = rows[~rows['income']]
+    categories, index = np.unique(expenses['category'], return_inverse=True)
+    totals = np.bincount(index, weights=expenses['amount'], minlength=len(categories))
+    labels = [names.get(category, UNCATEGORIZED) for category in categories.tolist()]
+    order = sorted(range(len(labels)), key=lambda i: (-totals[i], labels[i]))
+    return {
+        'labels': [labels[i] for i in order],
+        'totals': _amounts(totals[order]) if order else [],
+    }
+
+
+def report_series(user, start_date, end_date, max_points):
+    """Every report series for the range, computed from a single query."""
+    rows = fetch(user, start_date, end_date)
+    names = {category.pk: category.name for category in categories_for(user)}
+    return {
+        'daily': daily_series(rows, start_date, end_date, max_points),
+        'categories': category_series(rows, names),
+        'monthly': monthly_series(rows, start_date, end_date),
+    }
+
+
+# Months in the rolling average a projection starts from
+ROLLING_MONTHS = 3
+# Occurrences of a calendar month needed before its seasonal factor is used
+SEASONAL_MIN_YEARS = 2
+
+
+def forecast_series(months, amounts, names, day, days_in_month):
+    """Trend, seasonality and end-of-month projection from monthly rollup totals.
+
+    ``months`` are ``(year, month)`` pairs, oldest first; the last one is the
+    current, partial month at ``day`` of ``days_in_month``. ``amounts`` maps
+    each month to ``{(category_id, type): amount}`` and ``names`` category ids
+    to names; unknown categories count as uncategorized.
+    """
+    labels = [UNCATEGORIZED] + sorted(set(names.values()) - {UNCATEGORIZED})
+    rows = {label: i for i, label in enumerate(labels)}
+    expenses = np.zeros((len(labels), len(months)))
+    income = np.zeros(len(months))
+    for column, month in enumerate(months):
+        for (category_id, transaction_type), amount in amounts[month].items():
+            if transaction_type == Transaction.INCOME:
+                income[column] += amount
+            else:
+                expenses[rows[names.get(category_id, UNCATEGORIZED)], column] += amount
+
+    history, current = expenses[:, :-1], expenses[:, -1]
+    totals = history.sum(axis=0)
+    # Months before the first transaction would drag averages and the trend down
+    active = np.flatnonzero(totals + income[:-1])
+    first = active[0] if active.size else len(totals)
+    recent = history[:, max(first, len(totals) - ROLLING_MONTHS):]
+    average = recent.mean(axis=1) if recent.size else np.zeros(len(labels))
+
+    calendar_months = np.array([month for _, month in months[:-1]])
+    same_month = np.flatnonzero(calendar_months[first:] == months[-1][1]) + first
+    seasonal = 1.0
+    if same_month.size >= SEASONAL_MIN_YEARS and totals[first:].mean() > 0:
+        seasonal = float(totals[same_month].mean() / totals[first:].mean())
+
+    trend = 0.0
+    if len(totals) - first >= 2:
+        trend = float(np.polyfit(np.arange(len(totals) - first), totals[first:], 1)[0])
+
+    expected = average * seasonal
+    projected = current + expected * (days_in_month - day) / days_in_month
+    shown = totals[first:]
+    rolling = [None] * min(ROLLING_MONTHS - 1, len(shown))
+    if len(shown) >= ROLLING_MONTHS:
+        rolling += _amounts(np.convolve(shown, np.ones(ROLLING_MONTHS) / ROLLING_MONTHS, 'valid'))
+    order = np.lexsort((np.array(labels), -np.round(projected, 2)))
+    year, month = months[-1]
+    return {
+        'month': f'{year}-{month:02d}',
+        'day': day,
+        'days_in_month': days_in_month,
+        'spent': round(float(current.sum()), 2),
+        'expected': round(float(expected.sum()), 2),
+        'projected': round(float(projected.sum()), 2),
+        'seasonal_factor': round(seasonal, 4),
+        'monthly_trend': round(trend, 2),
+        'history': {
+            'labels': [f'{year}-{month:02d}' for year, month in months[first:-1]],
+            'expenses': _amounts(shown),
+            'income': _amounts(income[first:-1]),
+            'rolling': rolling,
+        },
+        'categories': [
+            {
+                'name': labels[i],
+                'spent': round(float(current[i]), 2),
+                'average': round(float(average[i]), 2),
+                'projected': round(float(projected[i]), 2),
+            }
+            for i in order.tolist() if current[i] or average[i]
+        ],
+    }
@@ -0,0 +1,99 @@
+import gzip
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz variants are written
+    brotli = None
+
+# Text formats worth compressing; fonts and images are compressed already
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map')
+# Smaller files gain less than the headers cost
+MIN_COMPRESS_SIZE = 512
+# Hashed names (ManifestStaticFilesStorage: name.0123456789ab.ext) never change
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# By preference; Accept-Encoding q-values are not weighed
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def compress(content):
+    """``{suffix: bytes}`` of the pre-compressed variants smaller than ``content``."""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Content-hashed static files with ``.gz`` (and, given brotli, ``.br``) copies.
+
+    collectstatic writes the variants next to each hashed text file, so
+    neither ``serve`` nor a web server (nginx ``gzip_static``/``brotli_static``)
+    compresses on the fly.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if not name.endswith(COMPRESSIBLE) or self.size(name) < MIN_COMPRESS_SIZE:
+                continue
+            with self.open(name) as original:
+                variants = compress(original.read())
+            for suffix, data in variants.items():
+                path = self.path(name + suffix)
+                with open(path, 'wb') as variant:
+                    variant.write(data)
+                yield name, name + suffix, True
+
+
+@require_safe
+def serve(request, path):
+    """Serve a collected static file, pre-compressed where the client accepts it.
+
+    For deployments without a web server in front (``EXPENSES_SERVE_STATIC``).
+    Hashed names are cached for a year; other files are revalidated.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Not found')
+    if not os.path.isfile(full_path):
+        raise Http404('Not found')
+
+    modified = int(os.stat(full_path).st_mtime)
+    immutable = HASHED_NAME.search(path) is not None
+    if not immutable:
+        not_modified = get_conditional_response(request, last_modified=modified)
+        if not_modified is not None:
+            return not_modified
+
+    accepted = {value.split(';')[0].strip() for value in request.headers.get('Accept-Encoding', '').split(',')}
+    encoding, variant = None, full_path
+    for name, suffix in ENCODINGS:
+        if name in accepted and os.path.isfile(full_path + suffix):
+            encoding, variant = name, full_path + suffix
+            break
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = FileResponse(open(variant, 'rb'), content_type=content_type)
+    response.headers.pop('Content-Disposition', None)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Last-Modified'] = http_date(modified)
+    response['Cache-Control'] = IMMUTABLE if immutable else 'public, no-cache'
+    return response
@@ -0,0 +1,172 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Budget, Transaction
+from .rollups import CENTS
+
+
+def _window_transactions(user, category, start_date, end_date):
+    return Transaction.objects.filter(
+        user=user, category=category, transaction_type=Transaction.EXPENSE,
+        date__gte=start_date, date__lte=end_date,
+    ).order_by()
+
+
+def with_computed_spent(budgets):
+    """Annotate a Budget queryset with ``computed_spent`` and ``computed_count`` from Transaction.
+
+    The sums are correlated subqueries, so checking any number of budgets is
+    a single SELECT. Pages read the maintained ``spent`` column instead; this
+    is what reconciliation compares it against.
+    """
+    window = _window_transactions(
+        user=OuterRef('user'), category=OuterRef('category'),
+        start_date=OuterRef('start_date'), end_date=OuterRef('end_date'),
+    ).values('user')
+    money = DecimalField(max_digits=12, decimal_places=2)
+    return budgets.annotate(
+        computed_spent=Coalesce(
+            Subquery(window.annotate(total=Sum('amount')).values('total'), output_field=money),
+            Value(Decimal('0')),
+            output_field=money,
+        ),
+        computed_count=Coalesce(
+            Subquery(window.annotate(rows=Count('id')).values('rows'), output_field=IntegerField()),
+            Value(0),
+        ),
+    )
+
+
+def compute(budget):
+    """``(spent, transaction_count)`` of one budget, straight from its transactions."""
+    row = _window_transactions(
+        user=budget.user_id, category=budget.category_id,
+        start_date=budget.start_date, end_date=budget.end_date,
+    ).aggregate(total=Sum('amount'), rows=Count('id'))
+    # SQLite sums decimals as floats; round to the stored precision
+    return (row['total'] or Decimal('0')).quantize(CENTS), row['rows']
+
+
+def apply_deltas(deltas):
+    """Fold TransactionDelta records into the ``spent`` and ``transaction_count`` of the budgets they fall in.
+
+    Only expense deltas with a category count. The budgets covering them are
+    locked and loaded in one query and incremented in one ``executemany``.
+    Returns the ids of active budgets the deltas pushed over their amount.
+    """
+    # (user_id, category_id) -> date -> [amount, count]
+    folded = defaultdict(lambda: defaultdict(lambda: [Decimal('0'), 0]))
+    for delta in deltas:
+        if delta.transaction_type == Transaction.EXPENSE and delta.category_id is not None:
+            change = folded[delta.user_id, delta.category_id][delta.date]
+            change[0] += delta.amount
+            change[1] += delta.count
+    if not folded:
+        return []
+
+    dates = [day for days in folded.values() for day in days]
+    with transaction.atomic():
+        budgets = Budget.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _ in folded},
+            category_id__in={category_id for _, category_id in folded},
+            start_date__lte=max(dates),
+            end_date__gte=min(dates),
+        ).order_by('pk').values_list('pk', 'user_id', 'category_id', 'start_date', 'end_date',
+                                     'amount', 'spent', 'is_active')
+        updates, exceeded = [], []
+        for pk, user_id, category_id, start_date, end_date, amount, spent, is_active in budgets:
+            change, count = Decimal('0'), 0
+            for day, (delta_amount, delta_count) in folded.get((user_id, category_id), {}).items():
+                if start_date <= day <= end_date:
+                    change += delta_amount
+                    count += delta_count
+            if not (change or count):
+                continue
+            updates.append((change, count, pk))
+            if is_active and spent <= amount < spent + change:
+                exceeded.append(pk)
+
+        if updates:
+            quote = connection.ops.quote_name
+            with connection.cursor() as cursor:
+                # ROUND keeps SQLite, which adds decimals as floats, at whole cents
+                cursor.executemany(
+                    f"UPDATE {quote(Budget._meta.db_table)} "
+                    f"SET {quote('spent')} = ROUND({quote('spent')} + %s, 2), "
+                    f"{quote('transaction_count')} = {quote('transaction_count')} + %s "
+                    f"WHERE {quote('id')} = %s",
+                    updates,
+                )
+    return exceeded
+
+
+def verify(user=None):
+    """Return ``(budget, expected, actual)`` for every budget whose counters have drifted.
+
+    ``expected`` and ``actual`` are ``(spent, transaction_count)`` pairs.
+    """
+    budgets = Budget.objects.all() if user is None else Budget.objects.filter(user=user)
+    drift = []
+    for budget in with_computed_spent(budgets.select_related('category').order_by('pk')):
+        expected = (budget.computed_spent.quantize(CENTS), budget.computed_count)
+        actual = (budget.spent, budget.transaction_count)
+        if expected != actual:
+            drift.append((budget, expected, actual))
+    return drift
+
+
+def reconcile(user=None):
+    """Recompute the counters of drifted budgets (for one user, or everyone); returns the drift fixed.
+
+    The budgets are locked before the transactions are summed, so a write
+    racing with the recount waits and then applies its delta on top.
+    """
+    budgets = Budget.objects.all() if user is None else Budget.objects.filter(user=user)
+    with transaction.atomic():
+        list(budgets.select_for_update().order_by('pk').values_list('pk'))
+        drift = verify(user)
+        for budget, (spent, count), _ in drift:
+            budget.spent, budget.transaction_count = spent, count
+        Budget.objects.bulk_update([budget for budget, _, _ in drift], ['spent', 'transaction_count'],
+                                   batch_size=1000)
+    return drift
+
+
+def budget_progress(budget):
+    spent = budget.spent or Decimal('0')
+    return {
+        'category': budget.category,
+        'budget': budget.amount,
+        'spent': spent,
+        'remaining': budget.amount - spent,
+        'percent': int(spent * 100 / budget.amount) if budget.amount else 0,
+        'overspent': spent - budget.amount,
+    }
+
+
+def _overspent_budgets(user):
+    # A read of the maintained counters; Transaction is not touched
+    return Budget.objects.for_user(user).for_list().filter(is_active=True, spent__gt=F('amount'))
+
+
+def _alert(budget):
+    progress = budget_progress(budget)
+    return {
+        'category': progress['category'],
+        'budget': progress['budget'],
+        'spent': progress['spent'],
+        'overspent': progress['overspent'],
+    }
+
+
+def get_budget_alerts(user):
+    """Return the overspent active budgets of ``user`` in the dashboard alert format."""
+    return [_alert(budget) for budget in _overspent_budgets(user)]
+
+
+async def aget_budget_alerts(user):
+    return [_alert(budget) async for budget in _overspent_budgets(user)]
@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from . import watermarks
+from .models import Transaction
+from .recurring import BATCH_SIZE, next_occurrence
+from .rollups import CENTS
+from .signals import TransactionDelta, transactions_changed
+
+RECATEGORIZE = 'recategorize'
+CHANGE_TYPE = 'change_type'
+DELETE = 'delete'
+MARK_RECURRING = 'mark_recurring'
+
+ACTIONS = [
+    (RECATEGORIZE, 'Change category'),
+    (CHANGE_TYPE, 'Change type'),
+    (MARK_RECURRING, 'Mark recurring'),
+    (DELETE, 'Delete'),
+]
+
+
+def grouped_deltas(queryset, sign, **changes):
+    """Deltas for moving every row of ``queryset`` out of its group (``sign`` -1) or,
+    with ``changes`` to ``category_id``/``transaction_type``, into the changed group too.
+
+    One grouped query, so the cost follows the number of (date, category, type)
+    groups rather than the number of rows.
+    """
+    rows = queryset.order_by().values_list('user_id', 'date', 'category_id', 'transaction_type').annotate(
+        total=Sum('amount'), rows=Count('id')
+    )
+    deltas = []
+    for user_id, day, category_id, transaction_type, total, count in rows:
+        # SQLite sums decimals as floats; round to the stored precision
+        total = total.quantize(CENTS)
+        deltas.append(TransactionDelta(user_id, day, category_id, transaction_type, sign * total, sign * count))
+        if changes:
+            deltas.append(TransactionDelta(
+                user_id, day, changes.get('category_id', category_id),
+                changes.get('transaction_type', transaction_type), total, count,
+            ))
+    return deltas
+
+
+def _update(queryset, changes, **values):
+    """UPDATE ``queryset`` in one statement and send the deltas it causes."""
+    with transaction.atomic():
+        deltas = grouped_deltas(queryset, -1, **changes) if changes else []
+        # Without deltas nothing else advances the watermarks of the changed rows
+        user_ids = [] if deltas else list(queryset.order_by().values_list('user_id', flat=True).distinct())
+        updated = queryset.update(**changes, **values)
+        if deltas:
+            transactions_changed.send(sender=Transaction, deltas=deltas)
+        elif updated:
+            watermarks.touch(user_ids)
+    return updated
+
+
+def recategorize(queryset, category):
+    category_id = category.pk if category else None
+    return _update(queryset.exclude(category_id=category_id), {'category_id': category_id})
+
+
+def change_type(queryset, transaction_type):
+    return _update(queryset.exclude(transaction_type=transaction_type), {'transaction_type': transaction_type})
+
+
+def mark_recurring(queryset, frequency):
+    """Make the rows recurring templates, first due one ``frequency`` step after their date.
+
+    Rows that are already scheduled keep their next date and generated
+    occurrences are left unscheduled, so no series is started twice.
+    """
+    with transaction.atomic():
+        updated = _update(queryset, {}, recurring=True, recurrence_frequency=frequency)
+        unscheduled = queryset.filter(next_recurrence_date__isnull=True, recurrence_source__isnull=True)
+        Transaction.objects.bulk_update([
+            Transaction(pk=pk, next_recurrence_date=next_occurrence(day, frequency))
+            for pk, day in unscheduled.order_by().values_list('pk', 'date').iterator()
+        ], ['next_recurrence_date'], batch_size=BATCH_SIZE)
+    return updated
+
+
+def delete(queryset):
+    """DELETE ``queryset`` in one statement, without per-row delete signals.
+
+    QuerySet.delete() would load every row and send post_delete (and so
+    transactions_changed) once per row; the grouped deltas are sent instead.
+    """
+    with transaction.atomic():
+        deltas = grouped_deltas(queryset, -1)
+        # What the recurrence_source SET_NULL would have done
+        Transaction.objects.filter(recurrence_source__in=queryset.values('pk')).update(recurrence_source=None)
+        deleted = queryset.order_by()._raw_delete(queryset.db)
+        if deltas:
+            transactions_changed.send(sender=Transaction, deltas=deltas)
+    return deleted
+
+
+def apply(queryset, action, category=None, transaction_type=None, recurrence_frequency=None):
+    """Run a bulk ``action`` on ``queryset``; returns the number of rows changed."""
+    if action == RECATEGORIZE:
+        return recategorize(queryset, category)
+    if action == CHANGE_TYPE:
+        return change_type(queryset, transaction_type)
+    if action == MARK_RECURRING:
+        return mark_recurring(queryset, recurrence_frequency)
+    if action == DELETE:
+        return delete(queryset)
+    raise ValueError(f'Unknown bulk action {action!r}')
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+
+from . import watermarks
+from .models import Category
+
+FIELDS = ('id', 'name', 'user_id', 'is_default')
+DEFAULTS_KEY = 'expenses:categories:defaults:{version}'
+USER_KEY = 'expenses:categories:{user_id}:{version}'
+# Entries of superseded versions are never read again; let them expire
+TIMEOUT = 24 * 60 * 60
+
+
+def _cached(key, queryset):
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(queryset.values_list(*FIELDS))
+        cache.set(key, rows, TIMEOUT)
+    return [Category.from_db(queryset.db, FIELDS, row) for row in rows]
+
+
+def categories_for(user):
+    """The categories ``user`` can choose from (their own plus the defaults), by name.
+
+    The defaults, shared by every user, and the user's own categories are
+    cached separately in the default cache, each under its category version
+    (see watermarks.category_versions). Only category writes advance those
+    versions in the database, so each process sees a new, renamed or
+    deleted category on its next read while transaction writes keep the
+    cache. Callers building several forms should read this once and pass
+    it to each.
+    """
+    defaults_version, own_version = watermarks.category_versions(user.pk)
+    categories = _cached(DEFAULTS_KEY.format(version=defaults_version), Category.objects.filter(is_default=True))
+    categories += _cached(
+        USER_KEY.format(user_id=user.pk, version=own_version),
+        Category.objects.filter(user_id=user.pk, is_default=False),
+    )
+    return sorted(categories, key=lambda category: (category.name, category.pk))
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+
+from . import report_cache
+
+logger = logging.getLogger(__name__)
+
+# Rendered PNGs are stored with their owner; the spec lets an evicted image be re-rendered
+CHART_KEY = 'expenses:chart:{}'
+SPEC_KEY = 'expenses:chart-spec:{}'
+
+PENDING = object()
+
+_executor = None
+_pending = {}
+_lock = threading.Lock()
+
+
+def render(kind, data):
+    # Imported here so Matplotlib is only loaded by processes that draw charts
+    from . import rendering
+    return rendering.RENDERERS[kind](**data)
+
+
+def chart_id(user_id, kind, data):
+    """Content address of a chart; doubles as its ETag."""
+    raw = json.dumps([user_id, kind, data], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        # spawn: workers never inherit the parent's database connections
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.EXPENSES_CHART_WORKERS, mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def _store(cid, user_id, png):
+    report_cache.get_cache().set(CHART_KEY.format(cid), (user_id, png))
+
+
+def _finished(cid, user_id, future):
+    with _lock:
+        _pending.pop(cid, None)
+    try:
+        _store(cid, user_id, future.result())
+    except Exception:
+        logger.exception('Rendering chart %s failed', cid)
+
+
+def _schedule(cid, user_id, kind, data):
+    if not getattr(settings, 'EXPENSES_CHART_WORKERS', 0):
+        _store(cid, user_id, render(kind, data))
+        return
+    with _lock:
+        if cid in _pending:
+            return
+        future = _pending[cid] = get_executor().submit(render, kind, data)
+    future.add_done_callback(partial(_finished, cid, user_id))
+
+
+def request_chart(user_id, kind, data):
+    """Queue a chart for rendering unless it is already cached; return its id.
+
+    ``data`` holds the renderer's keyword arguments and must be JSON-serializable.
+    With ``EXPENSES_CHART_WORKERS = 0`` charts are rendered inline instead.
+    """
+    cid = chart_id(user_id, kind, data)
+    cache = report_cache.get_cache()
+    if cache.get(CHART_KEY.format(cid)) is None:
+        cache.set(SPEC_KEY.format(cid), (user_id, kind, data))
+        _schedule(cid, user_id, kind, data)
+    return cid
+
+
+def get_chart(cid, user_id):
+    """Return the PNG bytes, PENDING while it renders, or None if unknown to this user."""
+    cache = report_cache.get_cache()
+    stored = cache.get(CHART_KEY.format(cid))
+    if stored is not None:
+        owner, png = stored
+        return png if owner == user_id else None
+
+    spec = cache.get(SPEC_KEY.format(cid))
+    if spec is None or spec[0] != user_id:
+        return None
+    _schedule(cid, *spec)
+    stored = cache.get(CHART_KEY.format(cid))
+    return stored[1] if stored is not None else PENDING
@@ -0,0 +1,61 @@
+from calendar import monthrange
+
+from django.db.models import Q
+
+from . import report_cache, rollups
+from .categories import categories_for
+from .models import MonthlyRollup
+
+# Complete months before the current one that trends and averages look at;
+# together with the rollups this bounds the work whatever the history length
+HISTORY_MONTHS = 36
+
+STATE_KEY = 'expenses:forecast:{user_id}'
+
+
+def window(today, history=HISTORY_MONTHS):
+    """``(year, month)`` of the last ``history`` complete months and the current one, oldest first."""
+    index = today.year * 12 + today.month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index - history, index + 1)]
+
+
+def monthly_amounts(user, months):
+    """Rollup totals per month of ``months`` as ``{(year, month): {(category_id, type): amount}}``.
+
+    The user's months are cached together, each with the version its
+    rollup rows had when read (see rollups.month_versions). Every write
+    advances the versions of the months it changes in the database, so
+    each process re-reads exactly those months, in one query, and keeps
+    the rest.
+    """
+    cache = report_cache.get_cache()
+    state_key = STATE_KEY.format(user_id=user.pk)
+    state = cache.get(state_key) or {}
+    versions = rollups.month_versions(user, months)
+
+    stale = [month for month in months if month not in state or state[month][0] != versions[month]]
+    if stale:
+        fresh = {month: (versions[month], {}) for month in stale}
+        condition = Q()
+        for year, month in stale:
+            condition |= Q(year=year, month=month)
+        rows = MonthlyRollup.objects.filter(condition, user=user).order_by().values_list(
+            'year', 'month', 'category_id', 'transaction_type', 'total'
+        )
+        for year, month, category_id, transaction_type, total in rows:
+            fresh[year, month][1][category_id, transaction_type] = float(total)
+        state = {month: state[month] for month in months if month in state}
+        state.update(fresh)
+        cache.set(state_key, state)
+    return {month: state[month][1] for month in months}
+
+
+def forecast(user, today):
+    """Spending trend, seasonality and end-of-month projection for ``today``'s month."""
+    from .analytics import forecast_series
+
+    months = window(today)
+    names = {category.pk: category.name for category in categories_for(user)}
+    return forecast_series(
+        months, monthly_amounts(user, months), names, today.day, monthrange(today.year, today.month)[1]
+    )
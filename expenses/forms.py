@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordChangeForm, PasswordResetForm, SetPasswordForm
 from .models import Transaction, Category, Budget
+from . import bulk, recurring
+from .categories import categories_for
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django import forms
@@ -8,6 +10,48 @@ from django.contrib.auth.forms import AuthenticationForm
 
 User = get_user_model()
 
+class CategoryChoiceField(forms.ModelChoiceField):
+    """Category select whose choices come from the per-user category cache.
+
+    Call ``set_user()`` to scope it; rendering and validation then run no
+    queries. Unscoped, it behaves like a plain ModelChoiceField.
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Category.objects.all())
+        self.categories = None
+        super().__init__(**kwargs)
+    
+    def set_user(self, user, categories=None):
+        """Scope the choices to ``user``; ``categories`` is their categories_for() if already read."""
+        if categories is None:
+            categories = categories_for(user)
+        self.categories = {category.pk: category for category in categories}
+        # Kept for anything that inspects the queryset; also refreshes the widget choices
+        self.queryset = Category.objects.filter(user=user) | Category.objects.filter(is_default=True)
+    
+    def _get_choices(self):
+        if self.categories is None:
+            return super()._get_choices()
+        choices = [('', self.empty_label)] if self.empty_label is not None else []
+        return choices + [(pk, self.label_from_instance(category)) for pk, category in self.categories.items()]
+    
+    choices = property(_get_choices, forms.ChoiceField.choices.fset)
+    
+    def to_python(self, value):
+        if self.categories is None:
+            return super().to_python(value)
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Category):
+            value = value.pk
+        try:
+            return self.categories[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value}
+            )
+
+
 class UserRegisterForm(UserCreationForm):
     email = forms.EmailField(required=True)
 
@@ -22,10 +66,12 @@ class UserLoginForm(AuthenticationForm):
         fields = ['username', 'password', 'remember_me']
 
 class TransactionForm(forms.ModelForm):
+    category = CategoryChoiceField(required=False)
+    
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
         if user:
-            self.fields['category'].queryset = Category.objects.filter(user=user) | Category.objects.filter(is_default=True)
+            self.fields['category'].set_user(user)
     
     class Meta:
         model = Transaction
@@ -41,10 +87,12 @@ class CategoryForm(forms.ModelForm):
         fields = ['name']
 
 class BudgetForm(forms.ModelForm):
+    category = CategoryChoiceField()
+    
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
         if user:
-            self.fields['category'].queryset = Category.objects.filter(user=user) | Category.objects.filter(is_default=True)
+            self.fields['category'].set_user(user)
     
     class Meta:
         model = Budget
@@ -57,10 +105,81 @@ class BudgetForm(forms.ModelForm):
 class TransactionFilterForm(forms.Form):
     start_date = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
     end_date = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
-    category = forms.ModelChoiceField(queryset=Category.objects.none(), required=False)
+    category = CategoryChoiceField(queryset=Category.objects.none(), required=False)
     transaction_type = forms.ChoiceField(choices=Transaction.TRANSACTION_TYPES, required=False)
     
-    def __init__(self, *args, user=None, **kwargs):
+    def __init__(self, *args, user=None, categories=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if user:
+            self.fields['category'].set_user(user, categories)
+    
+    def filter_queryset(self, queryset):
+        """Apply the cleaned filters to a Transaction queryset."""
+        data = self.cleaned_data
+        if data.get('start_date'):
+            queryset = queryset.filter(date__gte=data['start_date'])
+        if data.get('end_date'):
+            queryset = queryset.filter(date__lte=data['end_date'])
+        if data.get('category'):
+            queryset = queryset.filter(category=data['category'])
+        if data.get('transaction_type'):
+            queryset = queryset.filter(transaction_type=data['transaction_type'])
+        return queryset
+
+class IdListField(forms.Field):
+    """A list of primary keys, e.g. from a column of checkboxes sharing one name."""
+    widget = forms.MultipleHiddenInput
+    
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return [int(pk) for pk in value]
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Enter a list of ids.', code='invalid')
+
+class TransactionBulkForm(forms.Form):
+    """A bulk action on the selected transactions or on every row matching the list filters."""
+    SELECTED = 'selected'
+    FILTERED = 'filtered'
+    SCOPE_CHOICES = [(SELECTED, 'Selected transactions'), (FILTERED, 'All transactions matching the filters')]
+    
+    action = forms.ChoiceField(choices=bulk.ACTIONS)
+    scope = forms.ChoiceField(choices=SCOPE_CHOICES, initial=SELECTED)
+    # Any ids are accepted; the view scopes them to the user's transactions
+    selected = IdListField(required=False)
+    category = CategoryChoiceField(required=False, empty_label='Uncategorized')
+    transaction_type = forms.ChoiceField(choices=Transaction.TRANSACTION_TYPES, required=False)
+    recurrence_frequency = forms.ChoiceField(
+        choices=[(frequency, frequency.title()) for frequency in recurring.FREQUENCIES], required=False
+    )
+    
+    def __init__(self, *args, user=None, categories=None, **kwargs):
         super().__init__(*args, **kwargs)
         if user:
-            self.fields['category'].queryset = Category.objects.filter(user=user) | Category.objects.filter(is_default=True)
\ No newline at end of file
+            self.fields['category'].set_user(user, categories)
+    
+    def clean(self):
+        data = super().clean()
+        action = data.get('action')
+        if data.get('scope') == self.SELECTED and not data.get('selected'):
+            raise forms.ValidationError('Select at least one transaction.')
+        if action == bulk.CHANGE_TYPE and not data.get('transaction_type'):
+            self.add_error('transaction_type', 'Choose the new type.')
+        if action == bulk.MARK_RECURRING and not data.get('recurrence_frequency'):
+            self.add_error('recurrence_frequency', 'Choose how often it recurs.')
+        return data
+
+class TransactionRowForm(TransactionForm):
+    """TransactionForm without the category, for importers that resolve categories by name."""
+    category = None
+    
+    class Meta(TransactionForm.Meta):
+        fields = [field for field in TransactionForm.Meta.fields if field != 'category']
+
+class TransactionImportForm(forms.Form):
+    FORMAT_CHOICES = [('auto', 'Detect from file name'), ('csv', 'CSV'), ('ofx', 'OFX / QFX')]
+    
+    file = forms.FileField(help_text='CSV with Date, Amount, Type, Category and Description columns, or an OFX/QFX bank statement.')
+    file_format = forms.ChoiceField(choices=FORMAT_CHOICES, initial='auto', label='Format')
+    create_categories = forms.BooleanField(required=False, initial=True, label='Create categories that do not exist yet')
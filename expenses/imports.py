@@ -0,0 +1,188 @@
+import csv
+import io
+import re
+import time
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .categories import categories_for
+from .forms import TransactionRowForm
+from .models import Category, Transaction
+from .signals import created_deltas, transactions_changed
+
+# Rows per bulk_create and per database transaction
+BATCH_SIZE = 1000
+# Per-row errors kept for the report; the rest are only counted
+MAX_ERRORS = 1000
+
+FORMATS = ('csv', 'ofx')
+
+# Header aliases, compared lower-cased; the export's own headers import as-is
+CSV_COLUMNS = {
+    'date': ('date', 'posted', 'transaction date'),
+    'amount': ('amount', 'value'),
+    'type': ('type', 'transaction_type'),
+    'category': ('category',),
+    'description': ('description', 'memo', 'name', 'payee'),
+}
+TYPE_NAMES = {
+    'in': Transaction.INCOME, 'income': Transaction.INCOME, 'credit': Transaction.INCOME,
+    'ex': Transaction.EXPENSE, 'expense': Transaction.EXPENSE, 'debit': Transaction.EXPENSE,
+}
+
+OFX_TAG_RE = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+ImportResult = namedtuple('ImportResult', ['imported', 'failed', 'errors', 'categories_created', 'elapsed'])
+
+
+def detect_format(name):
+    return 'ofx' if name.lower().endswith(('.ofx', '.qfx')) else 'csv'
+
+
+def csv_rows(stream):
+    """Yield ``(line number, raw row dict)`` from a CSV text stream, one row at a time."""
+    reader = csv.reader(stream)
+    header = [column.strip().lower() for column in next(reader, [])]
+    positions = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in header:
+                positions[field] = header.index(alias)
+                break
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield reader.line_num, {
+            field: values[position].strip() if position < len(values) else ''
+            for field, position in positions.items()
+        }
+
+
+def ofx_rows(stream):
+    """Yield ``(line number, raw row dict)`` for each <STMTTRN> of an OFX/QFX statement.
+
+    Handles both SGML (unclosed tags) and XML flavours; the file is read line by line.
+    """
+    current, start = None, 0
+    for number, line in enumerate(stream, 1):
+        for closing, tag, value in OFX_TAG_RE.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and current is not None:
+                    yield start, current
+                    current = None
+                elif not closing:
+                    current, start = {}, number
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+
+
+def _ofx_row(raw):
+    posted = raw.get('DTPOSTED', '')
+    return {
+        'date': f'{posted[:4]}-{posted[4:6]}-{posted[6:8]}' if len(posted) >= 8 else posted,
+        'amount': raw.get('TRNAMT', ''),
+        'type': '',
+        'category': raw.get('CATEGORY', ''),
+        'description': ' - '.join(value for value in (raw.get('NAME'), raw.get('MEMO')) if value),
+    }
+
+
+def _signed_amount(amount, type_name):
+    """Return ``(amount, transaction type)``; without a type, the sign decides."""
+    transaction_type = TYPE_NAMES.get(type_name.lower(), type_name)
+    if type_name:
+        return amount, transaction_type
+    try:
+        value = Decimal(amount.replace(',', ''))
+    except InvalidOperation:
+        return amount, Transaction.EXPENSE
+    return str(abs(value)), Transaction.INCOME if value > 0 else Transaction.EXPENSE
+
+
+class TransactionImporter:
+    """Validate rows like TransactionForm and insert them for ``user`` in batches.
+
+    Category names are resolved through an in-memory map of the categories
+    the user can choose from; unknown names are created when
+    ``create_categories`` is set, otherwise the row fails. A failing row
+    is reported and skipped; it never aborts the file.
+    """
+
+    def __init__(self, user, batch_size=BATCH_SIZE, create_categories=True):
+        self.user = user
+        self.batch_size = batch_size
+        self.create_categories = create_categories
+        self.category_ids = {category.name.lower(): category.pk for category in categories_for(user)}
+        self.categories_created = 0
+
+    def category_id(self, name):
+        key = name.lower()
+        if key not in self.category_ids:
+            category, created = Category.objects.get_or_create(user=self.user, name=name[:100])
+            self.category_ids[key] = category.pk
+            self.categories_created += created
+        return self.category_ids[key]
+
+    def build(self, row):
+        """Return ``(Transaction, None)`` for a valid row, or ``(None, error messages)``."""
+        name = row.get('category', '')
+        if name and name.lower() not in self.category_ids and not self.create_categories:
+            return None, [f"category: Unknown category '{name}'."]
+
+        amount, transaction_type = _signed_amount(row.get('amount', ''), row.get('type', ''))
+        form = TransactionRowForm({
+            'amount': amount,
+            'date': row.get('date', ''),
+            'description': row.get('description', ''),
+            'transaction_type': transaction_type,
+        })
+        if not form.is_valid():
+            return None, [f'{field}: {message}' for field, messages in form.errors.items() for message in messages]
+        instance = form.save(commit=False)
+        instance.user = self.user
+        # Resolved last, so categories are only created for otherwise valid rows
+        instance.category_id = self.category_id(name) if name else None
+        return instance, None
+
+    def flush(self, batch):
+        with transaction.atomic():
+            Transaction.objects.bulk_create(batch)
+            transactions_changed.send(sender=Transaction, deltas=created_deltas(batch))
+
+    def run(self, rows):
+        """Import ``(line number, raw row)`` pairs; returns an ImportResult."""
+        started = time.perf_counter()
+        imported = failed = 0
+        errors, batch = [], []
+        for line, row in rows:
+            instance, messages = self.build(row)
+            if instance is None:
+                failed += 1
+                if len(errors) < MAX_ERRORS:
+                    errors.append((line, messages))
+                continue
+            batch.append(instance)
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+            imported += len(batch)
+        return ImportResult(imported, failed, errors, self.categories_created, time.perf_counter() - started)
+
+
+def import_file(user, binary_file, file_format='csv', **options):
+    """Stream-import an uploaded or opened binary file of the given format."""
+    stream = io.TextIOWrapper(binary_file, encoding='utf-8-sig', errors='replace', newline='')
+    if file_format == 'ofx':
+        rows = ((line, _ofx_row(raw)) for line, raw in ofx_rows(stream))
+    else:
+        rows = csv_rows(stream)
+    try:
+        return TransactionImporter(user, **options).run(rows)
+    finally:
+        stream.detach()
@@ -0,0 +1,92 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from expenses.models import Budget, Transaction
+from expenses.seeding import seed_transactions
+
+
+class Command(BaseCommand):
+    help = ('Show query plans and timings for the hot Transaction access paths, '
+            'optionally seeding synthetic data first.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Seed synthetic data before measuring.')
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--transactions', type=int, default=1_000_000,
+                            help='Total transactions to seed across all users.')
+        parser.add_argument('--username', help='Measure queries for this user (default: the busiest one).')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            started = time.perf_counter()
+            per_user = max(1, options['transactions'] // options['users'])
+            seed_transactions(users=options['users'], transactions_per_user=per_user)
+            self.stdout.write(
+                f"Seeded {per_user * options['users']} transactions in {time.perf_counter() - started:.1f}s"
+            )
+
+        user = self.get_user(options['username'])
+        today = timezone.now().date()
+        start_of_month = today.replace(day=1)
+        category_id = Transaction.objects.filter(user=user, category__isnull=False).values_list(
+            'category_id', flat=True).first()
+
+        paths = {
+            'TransactionListView': Transaction.objects.filter(user=user).order_by('-date', '-id')[:10],
+            'TransactionListView (type filter)': Transaction.objects.filter(
+                user=user, transaction_type=Transaction.EXPENSE).order_by('-date')[:10],
+            'TransactionListView (category filter)': Transaction.objects.filter(
+                user=user, category_id=category_id, transaction_type=Transaction.EXPENSE,
+                date__gte=today.replace(year=today.year - 1)).order_by('-date')[:10],
+            'dashboard totals': Transaction.objects.filter(
+                user=user, transaction_type=Transaction.INCOME,
+                date__range=[start_of_month, today]).values('user').annotate(total=Sum('amount')),
+            'dashboard recent': Transaction.objects.filter(user=user).order_by('-date')[:5],
+            'dashboard budgets': Budget.objects.filter(user=user, is_active=True, spent__gt=F('amount')),
+            'reports (analytics.fetch)': Transaction.objects.filter(
+                user=user, date__range=[today.replace(year=today.year - 1), today]).order_by().values_list(
+                'date', 'transaction_type', 'category_id').annotate(total=Sum('amount')),
+            'process_recurring_transactions': Transaction.objects.filter(
+                user=user, recurring=True, next_recurrence_date__lte=today),
+        }
+
+        for name, queryset in paths.items():
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            plan = queryset.explain()
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: best of {options["repeat"]} {min(timings) * 1000:.2f} ms'
+            ))
+            self.stdout.write(plan)
+            if self.is_full_scan(plan):
+                self.stdout.write(self.style.WARNING('  -> full table scan'))
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User '{username}' does not exist")
+        busiest = (
+            Transaction.objects.order_by().values('user').annotate(rows=Count('id')).order_by('-rows').first()
+        )
+        if busiest is None:
+            raise CommandError('No transactions to measure; run with --seed')
+        return User.objects.get(pk=busiest['user'])
+
+    @staticmethod
+    def is_full_scan(plan):
+        # SQLite: "SCAN expenses_transaction" without an index; Postgres: "Seq Scan"
+        lines = plan.splitlines()
+        return any(
+            ('SCAN expenses_transaction' in line and 'INDEX' not in line) or 'Seq Scan on expenses_transaction' in line
+            for line in lines
+        )
@@ -0,0 +1,67 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from expenses import search
+from expenses.models import Transaction
+from expenses.seeding import seed_transactions
+
+QUERIES = ['synthetic', 'inc', 'food', '4821', 'amount:>100 cat:food', 'type:income before:2025-01-01']
+
+
+def legacy_search(user, query):
+    """The original search_transactions lookup, kept for comparison."""
+    return Transaction.objects.filter(
+        Q(user=user) &
+        (Q(description__icontains=query) |
+         Q(category__name__icontains=query) |
+         Q(amount__icontains=query))
+    ).order_by('-date')
+
+
+class Command(BaseCommand):
+    help = 'Compare first-page search latency of the indexed search backend with the original LIKE search.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Transactions to seed for a new user.')
+        parser.add_argument('--username', help='Benchmark an existing user instead of seeding one.')
+        parser.add_argument('--repeat', type=int, default=7)
+        parser.add_argument('--query', action='append', dest='queries', help='Query to time (repeatable).')
+
+    def handle(self, *args, **options):
+        if options['username']:
+            try:
+                user = User.objects.get(username=options['username'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['username']}' does not exist")
+        else:
+            user = seed_transactions(users=1, transactions_per_user=options['rows'], prefix='search_bench')[0]
+
+        backend = search.get_backend()
+        rows = Transaction.objects.filter(user=user).count()
+        self.stdout.write(f'{rows} transactions for {user.username}, backend {type(backend).__name__}')
+
+        for query in options['queries'] or QUERIES:
+            legacy = self.time(lambda: list(legacy_search(user, query)[:11]), options['repeat'])
+
+            def indexed():
+                transactions, ordering = search.search_transactions(user, query, backend=backend)
+                return list(transactions.order_by(*ordering)[:11])
+
+            new = self.time(indexed, options['repeat'])
+            self.stdout.write(
+                f'{query!r:40} legacy {legacy * 1000:8.2f} ms   indexed {new * 1000:8.2f} ms   '
+                f'x{legacy / new if new else float("inf"):.1f}'
+            )
+
+    @staticmethod
+    def time(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
@@ -0,0 +1,65 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported
+PROBE = r'''
+import json, resource, sys, time
+started = time.perf_counter()
+import expense_tracker.wsgi
+imported = time.perf_counter()
+rss_imported = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+from django.test import Client
+client = Client(HTTP_HOST='localhost')
+for path in sys.argv[1:]:
+    client.get(path)
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_requests_ms': (served - imported) * 1000,
+    'rss_import_mb': rss_imported / 1024,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': sorted(name for name in ('pandas', 'numpy', 'matplotlib', 'plotly', 'seaborn') if name in sys.modules),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Measure cold-start import time and peak RSS of expense_tracker.wsgi in fresh '
+            'interpreters, including the first requests that load the URLconf and views.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Request this path after startup (repeatable; default: /login/).')
+        parser.add_argument('--json', action='store_true', help='Print the raw samples as JSON.')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/login/']
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'expense_tracker.settings')}
+        samples = []
+        for _ in range(options['repeat']):
+            result = subprocess.run(
+                [sys.executable, '-c', PROBE, *paths], cwd=settings.BASE_DIR, env=env,
+                capture_output=True, text=True,
+            )
+            if result.returncode:
+                raise CommandError(result.stderr.strip().splitlines()[-1])
+            samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+        if options['json']:
+            self.stdout.write(json.dumps(samples, indent=2))
+            return
+        for metric, unit in (('import_ms', 'ms'), ('first_requests_ms', 'ms'), ('rss_import_mb', 'MB'), ('rss_mb', 'MB')):
+            values = [sample[metric] for sample in samples]
+            self.stdout.write(
+                f'{metric:<18} median {statistics.median(values):8.1f} {unit}   '
+                f'min {min(values):8.1f}   max {max(values):8.1f}'
+            )
+        self.stdout.write(f"heavy modules loaded after {', '.join(paths)}: "
+                          f"{', '.join(samples[-1]['heavy_modules']) or 'none'}")
@@ -0,0 +1,160 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from expenses import profiling, watermarks
+from expenses.models import Transaction
+from expenses.seeding import seed_transactions
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def scenarios(today):
+    """``name -> (method, url, data, rolled back)``; rolled-back requests leave the data unchanged."""
+    year_ago = (today - timedelta(days=365)).isoformat()
+    return {
+        'dashboard': ('get', reverse('dashboard'), {}, False),
+        'transaction_list': ('get', reverse('transaction-list'), {}, False),
+        'transaction_list_filtered': ('get', reverse('transaction-list'), {
+            'transaction_type': Transaction.EXPENSE, 'start_date': year_ago,
+        }, False),
+        'search': ('get', reverse('search-transactions'), {'q': 'food'}, False),
+        'reports': ('post', reverse('reports'), {'start_date': year_ago, 'end_date': today.isoformat()}, False),
+        'export_csv': ('get', reverse('export-transactions'), {}, False),
+        'process_recurring': ('get', reverse('process-recurring'), {}, True),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Drive the main views through the test client for users of several data sizes, recording '
+            'latency, query count and peak memory to a JSON file that can be compared between runs. '
+            'Point SQLITE_PATH or DATABASE_URL at a scratch database: missing users are seeded.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                            help='Transactions per benchmark user, one user per size.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per view and size.')
+        parser.add_argument('--view', action='append', dest='views', help='Only run this scenario (repeatable).')
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', metavar='JSON', help='Results file of an earlier run to compare with.')
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        all_scenarios = scenarios(today)
+        unknown = set(options['views'] or []) - set(all_scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        selected = {name: all_scenarios[name] for name in options['views'] or all_scenarios}
+        baseline = self.load(options['compare']) if options['compare'] else None
+
+        results = {}
+        for size in options['sizes']:
+            user = self.benchmark_user(size)
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+            results[str(size)] = {}
+            for name, scenario in selected.items():
+                sample = self.measure(client, user, scenario, options['repeat'])
+                results[str(size)][name] = sample
+                self.report(size, name, sample, (baseline or {}).get(str(size), {}).get(name))
+
+        with open(options['output'], 'w') as output:
+            json.dump({'meta': self.meta(options), 'results': results}, output, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def benchmark_user(self, size):
+        prefix = f'suite{size}'
+        user = User.objects.filter(username=f'{prefix}_0').first()
+        if user is None:
+            started = time.perf_counter()
+            user = seed_transactions(users=1, transactions_per_user=size, prefix=prefix, budget_months=12)[0]
+            self.stdout.write(f'Seeded {user.username} with {size} transactions in {time.perf_counter() - started:.1f}s')
+        return user
+
+    def request(self, client, user, scenario):
+        """Make one request and read the whole body; returns its RequestMetrics, seconds and body size."""
+        method, url, data, rolled_back = scenario
+        metrics = profiling.RequestMetrics()
+        # Time the report build rather than a cache hit
+        watermarks.touch([user.pk])
+        with transaction.atomic() if rolled_back else nullcontext(), connection.execute_wrapper(metrics):
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            elapsed = time.perf_counter() - started
+            if rolled_back:
+                transaction.set_rollback(True)
+        if response.status_code >= 400:
+            raise CommandError(f'{method.upper()} {url} returned {response.status_code}')
+        return metrics, elapsed, size
+
+    def measure(self, client, user, scenario, repeat):
+        self.request(client, user, scenario)  # warm-up
+        timings, metrics = [], None
+        for _ in range(repeat):
+            metrics, elapsed, size = self.request(client, user, scenario)
+            timings.append(elapsed * 1000)
+        # Separately, since tracing slows the request down
+        tracemalloc.start()
+        try:
+            self.request(client, user, scenario)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'min_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'peak_kib': round(peak / 1024),
+            'bytes': size,
+        }
+
+    def report(self, size, name, sample, previous):
+        line = (f"{size:>8} {name:<26} median {sample['median_ms']:8.1f} ms   queries {sample['queries']:3}   "
+                f"peak {sample['peak_kib']:7} KiB   {sample['bytes']:9} bytes")
+        if previous:
+            change = (sample['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100
+            line += f"   vs {previous['median_ms']:.1f} ms ({change:+.0f}%), {previous['queries']} queries"
+        self.stdout.write(line)
+
+    def load(self, path):
+        try:
+            with open(path) as results:
+                return json.load(results)['results']
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f'Cannot read {path}: {error}')
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True,
+            ).stdout.strip() or None
+        except OSError:
+            commit = None
+        return {
+            'created': timezone.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'repeat': options['repeat'],
+        }
@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from expenses.models import Transaction
+
+MARKER = 'benchmark_writes'
+
+# Environment overrides per database profile; see the Database section of settings.py
+PROFILES = {
+    'sqlite': {
+        'baseline': {
+            'SQLITE_TUNING': '0', 'SQLITE_BUSY_TIMEOUT': '5',
+            'SQLITE_TRANSACTION_MODE': 'DEFERRED', 'DB_CONN_MAX_AGE': '0',
+        },
+        'tuned': {},
+    },
+    'postgresql': {
+        'baseline': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '0'},
+        'pooled': {'DB_POOL': '1'},
+    },
+}
+
+# Runs in a fresh interpreter so the profile's settings take effect
+PROBE = r'''
+import json, os, statistics, sys, threading, time
+import django
+django.setup()
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+username, threads, per_thread, marker = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+if connection.vendor == 'sqlite' and os.environ.get('SQLITE_TUNING') == '0':
+    # WAL mode is stored in the database file; undo what a tuned run left behind
+    connection.cursor().execute('PRAGMA journal_mode=DELETE')
+user = User.objects.get(username=username)
+url = reverse('transaction-create')
+clients = []
+for _ in range(threads):
+    client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+    client.force_login(user)
+    clients.append(client)
+connections.close_all()
+
+latencies, errors, start = [], [], threading.Barrier(threads + 1)
+
+def write(client, worker):
+    start.wait()
+    for i in range(per_thread):
+        started = time.perf_counter()
+        response = client.post(url, {
+            'amount': f'{worker + 1}.{i % 100:02d}', 'date': '2024-06-15',
+            'transaction_type': 'EX', 'description': marker,
+        })
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 302:
+            errors.append(response.status_code)
+    connections.close_all()
+
+workers = [threading.Thread(target=write, args=(client, n)) for n, client in enumerate(clients)]
+for worker in workers:
+    worker.start()
+start.wait()
+began = time.perf_counter()
+for worker in workers:
+    worker.join()
+elapsed = time.perf_counter() - began
+cuts = statistics.quantiles(latencies, n=100)
+print(json.dumps({
+    'requests': len(latencies), 'errors': len(errors), 'seconds': elapsed,
+    'p50_ms': cuts[49] * 1000, 'p99_ms': cuts[98] * 1000,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Measure concurrent write throughput of TransactionCreateView under the baseline and tuned '
+            'database profiles, each in a fresh interpreter. Benchmark rows are deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Transactions are created for this user.')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--per-thread', type=int, default=100, help='Requests per thread.')
+        parser.add_argument('--profile', action='append', dest='profiles', help='Only run this profile (repeatable).')
+        parser.add_argument('--keep', action='store_true', help='Keep the created transactions.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist")
+        profiles = PROFILES.get(connection.vendor)
+        if profiles is None:
+            raise CommandError(f'No write profiles for the {connection.vendor} backend')
+
+        try:
+            for name in options['profiles'] or profiles:
+                self.report(name, self.run_profile(name, profiles[name], user, options))
+        finally:
+            if not options['keep']:
+                Transaction.objects.filter(user=user, description=MARKER).delete()
+
+    def run_profile(self, name, overrides, user, options):
+        env = {
+            **os.environ, **overrides,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'expense_tracker.settings'),
+            'DJANGO_LOG_LEVEL': 'WARNING',
+        }
+        # Nothing of ours may hold the database while the probe runs
+        connection.close()
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, user.username, str(options['threads']), str(options['per_thread']), MARKER],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'{name}: {result.stderr.strip().splitlines()[-1]}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def report(self, name, sample):
+        self.stdout.write(
+            f"{name:<9} {(sample['requests'] - sample['errors']) / sample['seconds']:8.1f} writes/s   "
+            f"p50 {sample['p50_ms']:7.1f} ms   p99 {sample['p99_ms']:7.1f} ms   "
+            f"failed {sample['errors']}/{sample['requests']}"
+        )
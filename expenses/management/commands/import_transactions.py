@@ -0,0 +1,45 @@
+import resource
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from expenses import imports
+
+
+class Command(BaseCommand):
+    help = 'Stream-import transactions for a user from a CSV or OFX/QFX file. Invalid rows are reported and skipped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=imports.FORMATS, help='File format (default: from the file extension).')
+        parser.add_argument('--batch-size', type=int, default=imports.BATCH_SIZE,
+                            help='Rows per bulk insert and database transaction.')
+        parser.add_argument('--no-create-categories', action='store_true',
+                            help='Reject rows whose category does not exist instead of creating it.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist")
+
+        file_format = options['format'] or imports.detect_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as binary_file:
+                result = imports.import_file(
+                    user, binary_file, file_format,
+                    batch_size=options['batch_size'], create_categories=not options['no_create_categories'],
+                )
+        except OSError as error:
+            raise CommandError(error)
+
+        for line, errors in result.errors:
+            self.stderr.write(f"line {line}: {'; '.join(errors)}")
+        if result.failed:
+            self.stdout.write(self.style.WARNING(f'Skipped {result.failed} invalid rows.'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.imported} transactions ({result.categories_created} new categories) '
+            f'in {result.elapsed:.2f}s ({result.imported / result.elapsed if result.elapsed else 0:.0f} rows/s, '
+            f'peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB).'
+        ))
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+SERVERS = {
+    # Django's threaded development server, the current WSGI setup
+    'wsgi': lambda port: [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload', '--skip-checks'],
+    'asgi': lambda port: [
+        sys.executable, '-m', 'uvicorn', 'expense_tracker.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+    ],
+}
+DEFAULT_PATHS = ['/', '/transactions/', '/search/?q=food', '/export/']
+
+
+async def fetch(port, path, cookie):
+    """GET ``path`` and read the whole body; returns ``(status, seconds)``."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\nConnection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    while await reader.read(1 << 16):
+        pass
+    writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def run_load(port, path, cookie, requests, concurrency):
+    results = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            try:
+                results.append(await fetch(port, path, cookie))
+            except (OSError, IndexError, ValueError):
+                results.append((0, 0.0))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ('Load-test read-heavy pages under a local WSGI (runserver) and/or ASGI (uvicorn) server, '
+            'reporting throughput and p50/p95/p99 latency. The ASGI server needs uvicorn installed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Requests are made as this user.')
+        parser.add_argument('--server', choices=[*SERVERS, 'both'], default='both')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"Path to load (repeatable; default: {' '.join(DEFAULT_PATHS)}).")
+        parser.add_argument('--requests', type=int, default=200, help='Requests per path.')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist")
+        client = Client()
+        client.force_login(user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        servers = list(SERVERS) if options['server'] == 'both' else [options['server']]
+        if 'asgi' in servers and find_spec('uvicorn') is None:
+            raise CommandError('The ASGI load test needs uvicorn (pip install uvicorn).')
+
+        for server in servers:
+            process = self.start(server, options['port'])
+            try:
+                for path in options['paths'] or DEFAULT_PATHS:
+                    self.report(server, path, *asyncio.run(run_load(
+                        options['port'], path, cookie, options['requests'], options['concurrency']
+                    )))
+            finally:
+                process.terminate()
+                process.wait()
+
+    def start(self, server, port):
+        process = subprocess.Popen(
+            SERVERS[server](port), cwd=settings.BASE_DIR, env=os.environ.copy(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'The {server} server exited with status {process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                return process
+            except OSError:
+                time.sleep(0.1)
+        process.terminate()
+        raise CommandError(f'The {server} server did not start listening on port {port}')
+
+    def report(self, server, path, results, elapsed):
+        latencies = sorted(seconds * 1000 for status, seconds in results if status == 200)
+        errors = len(results) - len(latencies)
+        if len(latencies) < 2:
+            self.stdout.write(self.style.ERROR(f'{server:<5} {path:<24} {errors} of {len(results)} requests failed'))
+            return
+        cuts = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{server:<5} {path:<24} {len(results) / elapsed:8.1f} req/s   p50 {cuts[49]:7.1f} ms   '
+            f'p95 {cuts[94]:7.1f} ms   p99 {cuts[98]:7.1f} ms   errors {errors}'
+        )
@@ -0,0 +1,38 @@
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from expenses import recurring
+
+
+class Command(BaseCommand):
+    help = 'Generate every due occurrence of recurring transactions for all users. Safe to rerun.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only process this username.')
+        parser.add_argument('--date', type=date.fromisoformat, help='Process as of this date (default: today).')
+        parser.add_argument('--batch-size', type=int, default=recurring.BATCH_SIZE,
+                            help='Templates per database transaction.')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        started = time.perf_counter()
+        result = recurring.process_due(user, options['date'], options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        if result.skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Skipped {result.skipped} templates with an unknown recurrence frequency.'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.created} transactions from {result.templates} templates in {elapsed:.2f}s '
+            f'({result.created / elapsed if elapsed else 0:.0f} rows/s).'
+        ))
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from expenses import rollups, watermarks
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly rollup table from transactions, or check it for drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only rebuild/verify this username.')
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Report rows that differ from the transactions instead of rebuilding.',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        if options['verify']:
+            drift = rollups.verify(user)
+            for key, expected, actual in drift:
+                self.stdout.write(f'{dict(zip(rollups.KEY_FIELDS, key))}: expected {expected}, stored {actual}')
+            if drift:
+                raise CommandError(f'{len(drift)} rollup rows are inconsistent')
+            self.stdout.write(self.style.SUCCESS('Rollups are consistent.'))
+            return
+
+        created = rollups.rebuild(user)
+        watermarks.touch([user.pk if user else None])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} rollup rows.'))
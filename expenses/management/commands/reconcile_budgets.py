@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from expenses import budgets
+
+
+class Command(BaseCommand):
+    help = 'Recompute the maintained spent counters of budgets from transactions, reporting any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only reconcile/verify this username.')
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Report budgets that differ from the transactions instead of fixing them.',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        drift = budgets.verify(user) if options['verify'] else budgets.reconcile(user)
+        for budget, expected, actual in drift:
+            self.stdout.write(
+                f'Budget {budget.pk} ({budget.user_id}, {budget.category.name}, {budget.start_date} to '
+                f'{budget.end_date}): expected {expected}, stored {actual}'
+            )
+        if options['verify']:
+            if drift:
+                raise CommandError(f'{len(drift)} budgets are inconsistent')
+            self.stdout.write(self.style.SUCCESS('Budgets are consistent.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed {len(drift)} budgets.'))
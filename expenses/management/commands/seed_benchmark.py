@@ -0,0 +1,42 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from expenses.models import Budget, Transaction
+from expenses.seeding import seed_transactions
+
+
+class Command(BaseCommand):
+    help = ('Generate synthetic users with realistic transactions (see expenses.seeding.CATEGORY_PROFILES), '
+            'recurring templates and monthly budgets, using bulk inserts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--transactions', type=int, default=10_000, help='Transactions per user.')
+        parser.add_argument('--years', type=float, default=3, help='Spread transaction dates over this many years.')
+        parser.add_argument('--budget-months', type=int, default=12,
+                            help='Monthly budgets per user, up to the current month (0 for none).')
+        parser.add_argument('--no-recurring', action='store_true', help='Do not create recurring templates.')
+        parser.add_argument('--prefix', default='bench', help='Usernames are <prefix>_<n>.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        users = seed_transactions(
+            users=options['users'],
+            transactions_per_user=options['transactions'],
+            days=max(1, round(options['years'] * 365)),
+            prefix=options['prefix'],
+            rng=random.Random(options['seed']),
+            recurring=not options['no_recurring'],
+            budget_months=options['budget_months'],
+        )
+        elapsed = time.perf_counter() - started
+        transactions = Transaction.objects.filter(user__in=users).count()
+        budgets = Budget.objects.filter(user__in=users).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(users)} users ({users[-1].username} to {users[0].username}), '
+            f'{transactions} transactions and {budgets} budgets in {elapsed:.1f}s '
+            f'({transactions / elapsed:.0f} transactions/s).'
+        ))
@@ -0,0 +1,97 @@
+import itertools
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import profiling
+
+
+class PerformanceMiddleware:
+    """Time every request and aggregate the timings per URL name (see profiling).
+
+    Records wall time, query count and time, template render time and, for
+    every ``EXPENSES_PERF_TRACEMALLOC_EVERY``-th request, peak Python
+    allocation. Adds a Server-Timing header. Unless ``EXPENSES_PERF`` is
+    set the middleware removes itself at startup, leaving only the query hook
+    (profiling.record_query), which then costs a context variable lookup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'EXPENSES_PERF', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'EXPENSES_PERF_SERVER_TIMING', True)
+        self.trace_every = getattr(settings, 'EXPENSES_PERF_TRACEMALLOC_EVERY', 0)
+        self.requests = itertools.count(1)
+        # tracemalloc is process-wide, so one request is traced at a time
+        self.tracing = threading.Lock()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.measure() as finish:
+            response = self.get_response(request)
+        return finish(request, response)
+
+    async def __acall__(self, request):
+        with self.measure() as finish:
+            response = await self.get_response(request)
+        return finish(request, response)
+
+    @contextmanager
+    def measure(self):
+        """Collect metrics for the block; yields ``finish(request, response)`` to record them."""
+        metrics = profiling.RequestMetrics()
+
+        def finish(request, response):
+            wall_time = time.perf_counter() - started
+            match = getattr(request, 'resolver_match', None)
+            profiling.record(match.view_name if match else '<unresolved>', wall_time, metrics)
+            if self.server_timing:
+                response['Server-Timing'] = server_timing(wall_time, metrics)
+            return response
+
+        with ExitStack() as stack:
+            token = profiling.current.set(metrics)
+            stack.callback(profiling.current.reset, token)
+            if self.trace_every and next(self.requests) % self.trace_every == 0 and self.tracing.acquire(False):
+                stack.callback(self.tracing.release)
+                stack.enter_context(_traced(metrics))
+            started = time.perf_counter()
+            yield finish
+
+
+@contextmanager
+def _traced(metrics):
+    """Record the peak traced allocation of the block into ``metrics.peak_memory``."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        metrics.peak_memory = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+        if started:
+            tracemalloc.stop()
+
+
+def server_timing(wall_time, metrics):
+    parts = [
+        f'total;dur={wall_time * 1000:.1f}',
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'tpl;dur={metrics.template_time * 1000:.1f}',
+    ]
+    if metrics.peak_memory is not None:
+        parts.append(f'mem;desc="peak {metrics.peak_memory / 1024:.0f} KiB"')
+    return ', '.join(parts)
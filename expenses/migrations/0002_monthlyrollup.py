@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:43
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def build_rollups(apps, schema_editor):
+    Transaction = apps.get_model('expenses', 'Transaction')
+    MonthlyRollup = apps.get_model('expenses', 'MonthlyRollup')
+    rows = (
+        Transaction.objects.order_by()
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('user_id', 'year', 'month', 'category_id', 'transaction_type')
+        .annotate(total=Sum('amount'), rows=Count('id'))
+    )
+    MonthlyRollup.objects.bulk_create([
+        MonthlyRollup(
+            user_id=row['user_id'], year=row['year'], month=row['month'], category_id=row['category_id'],
+            transaction_type=row['transaction_type'],
+            # SQLite sums decimals as floats; round to the stored precision
+            total=Decimal(row['total']).quantize(Decimal('0.01')), count=row['rows'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('transaction_type', models.CharField(choices=[('IN', 'Income'), ('EX', 'Expense')], max_length=2)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='expenses.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+                'unique_together': {('user', 'year', 'month', 'category', 'transaction_type')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,142 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import expenses.models
+
+SQLITE_TABLE = [
+    """
+    CREATE VIRTUAL TABLE expenses_transaction_fts USING fts5(
+        description, category, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    """
+    INSERT INTO expenses_transaction_fts (rowid, description, category)
+    SELECT t.id, t.description, c.name
+    FROM expenses_transaction t LEFT JOIN expenses_category c ON c.id = t.category_id
+    """,
+]
+
+# Triggers keep the index in sync. SQLite drops those on expenses_transaction
+# whenever a migration remakes the table, so later migrations that alter
+# Transaction wrap their operations in sqlite_trigger_operations().
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER expenses_transaction_fts_insert AFTER INSERT ON expenses_transaction BEGIN
+        INSERT INTO expenses_transaction_fts (rowid, description, category)
+        VALUES (new.id, new.description, (SELECT name FROM expenses_category WHERE id = new.category_id));
+    END
+    """,
+    """
+    CREATE TRIGGER expenses_transaction_fts_delete AFTER DELETE ON expenses_transaction BEGIN
+        DELETE FROM expenses_transaction_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER expenses_transaction_fts_update AFTER UPDATE OF description, category_id ON expenses_transaction
+    BEGIN
+        UPDATE expenses_transaction_fts
+        SET description = new.description,
+            category = (SELECT name FROM expenses_category WHERE id = new.category_id)
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER expenses_category_fts_rename AFTER UPDATE OF name ON expenses_category BEGIN
+        UPDATE expenses_transaction_fts SET category = new.name
+        WHERE rowid IN (SELECT id FROM expenses_transaction WHERE category_id = new.id);
+    END
+    """,
+]
+
+SQLITE_DROP_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS expenses_category_fts_rename',
+    'DROP TRIGGER IF EXISTS expenses_transaction_fts_update',
+    'DROP TRIGGER IF EXISTS expenses_transaction_fts_delete',
+    'DROP TRIGGER IF EXISTS expenses_transaction_fts_insert',
+]
+
+SQLITE_FORWARD = SQLITE_TABLE + SQLITE_TRIGGERS
+SQLITE_REVERSE = SQLITE_DROP_TRIGGERS + ['DROP TABLE IF EXISTS expenses_transaction_fts']
+
+# Must match PostgresSearchBackend.vector
+POSTGRES_FORWARD = [
+    "CREATE INDEX expenses_transaction_search_idx ON expenses_transaction "
+    "USING GIN (to_tsvector('simple', coalesce(description, '')))",
+]
+
+POSTGRES_REVERSE = ['DROP INDEX IF EXISTS expenses_transaction_search_idx']
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def statements(connection, forward):
+    if connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        return SQLITE_FORWARD if forward else SQLITE_REVERSE
+    if connection.vendor == 'postgresql':
+        return POSTGRES_FORWARD if forward else POSTGRES_REVERSE
+    # Other backends use the unindexed fallback search
+    return []
+
+
+def create_search_index(apps, schema_editor):
+    for statement in statements(schema_editor.connection, forward=True):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    for statement in statements(schema_editor.connection, forward=False):
+        schema_editor.execute(statement)
+
+
+def _sqlite_fts_table_exists(connection):
+    return connection.vendor == 'sqlite' and 'expenses_transaction_fts' in connection.introspection.table_names()
+
+
+def drop_sqlite_triggers(apps, schema_editor):
+    if _sqlite_fts_table_exists(schema_editor.connection):
+        for statement in SQLITE_DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def create_sqlite_triggers(apps, schema_editor):
+    if _sqlite_fts_table_exists(schema_editor.connection):
+        for statement in SQLITE_DROP_TRIGGERS + SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def sqlite_trigger_operations(*operations):
+    """Wrap operations that may remake expenses_transaction on SQLite."""
+    return [
+        migrations.RunPython(drop_sqlite_triggers, create_sqlite_triggers),
+        *operations,
+        migrations.RunPython(create_sqlite_triggers, drop_sqlite_triggers),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0003_transaction_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionSearchIndex',
+            fields=[
+                ('transaction', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='expenses.transaction')),
+                ('description', models.TextField()),
+                ('category', models.TextField()),
+                ('document', expenses.models.SearchDocumentField(db_column='expenses_transaction_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'expenses_transaction_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
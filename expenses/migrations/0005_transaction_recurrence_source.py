@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:00
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+search_migration = import_module('expenses.migrations.0004_transaction_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0004_transaction_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = search_migration.sqlite_trigger_operations(
+        migrations.AddField(
+            model_name='transaction',
+            name='recurrence_source',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='expenses.transaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('recurrence_source', 'date'), name='txn_unique_occurrence'),
+        ),
+    )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0005_transaction_recurrence_source'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'date', 'transaction_type', 'category', 'amount'], name='txn_user_date_report_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:45
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def count_existing_spending(apps, schema_editor):
+    Budget = apps.get_model('expenses', 'Budget')
+    Transaction = apps.get_model('expenses', 'Transaction')
+    budgets = list(Budget.objects.all())
+    for budget in budgets:
+        row = Transaction.objects.filter(
+            user_id=budget.user_id, category_id=budget.category_id, transaction_type='EX',
+            date__gte=budget.start_date, date__lte=budget.end_date,
+        ).aggregate(total=Sum('amount'), rows=Count('id'))
+        budget.spent = (row['total'] or Decimal('0')).quantize(Decimal('0.01'))
+        budget.transaction_count = row['rows']
+    Budget.objects.bulk_update(budgets, ['spent', 'transaction_count'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0007_datawatermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='spent',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='transaction_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_spending, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0008_budget_spent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['date', 'id'], name='txn_date_id_idx'),
+        ),
+    ]
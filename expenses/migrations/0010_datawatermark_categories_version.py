@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0009_transaction_admin_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datawatermark',
+            name='categories_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -8,15 +8,26 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     is_default = models.BooleanField(default=False)
-    
+
     class Meta:
         verbose_name_plural = 'Categories'
         ordering = ['name']
         unique_together = ('user', 'name')
-    
+
     def __str__(self):
         return self.name
 
+class TransactionQuerySet(models.QuerySet):
+    # Everything the transaction rows on list pages render
+    LIST_FIELDS = ('date', 'description', 'amount', 'transaction_type', 'category__name')
+
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def for_list(self):
+        """Join the category and load only the columns list templates use."""
+        return self.select_related('category').only(*self.LIST_FIELDS)
+
 class Transaction(models.Model):
     INCOME = 'IN'
     EXPENSE = 'EX'
@@ -24,7 +35,7 @@ class Transaction(models.Model):
         (INCOME, 'Income'),
         (EXPENSE, 'Expense'),
     ]
-    
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0.01)])
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
@@ -34,16 +45,94 @@ class Transaction(models.Model):
     recurring = models.BooleanField(default=False)
     recurrence_frequency = models.CharField(max_length=20, blank=True, null=True)  # daily, weekly, monthly, yearly
     next_recurrence_date = models.DateField(blank=True, null=True)
-    
+    # The recurring template this row was generated from
+    recurrence_source = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences'
+    )
+
+    objects = TransactionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date']
-    
+        indexes = [
+            # Transaction list, recent transactions, reports date ranges
+            models.Index(fields=['user', 'date', 'id'], name='txn_user_date_idx'),
+            # Income/expense totals over a date range
+            models.Index(fields=['user', 'transaction_type', 'date'], name='txn_user_type_date_idx'),
+            # Category filters and budget spend
+            models.Index(fields=['user', 'category', 'transaction_type', 'date'], name='txn_user_cat_type_date_idx'),
+            # Covers the report query (analytics.fetch) so it never touches the table
+            models.Index(fields=['user', 'date', 'transaction_type', 'category', 'amount'], name='txn_user_date_report_idx'),
+            # Across all users: the admin changelist order and its date_hierarchy ranges
+            models.Index(fields=['date', 'id'], name='txn_date_id_idx'),
+            # Due recurring templates; partial where the backend supports it
+            models.Index(
+                fields=['user', 'next_recurrence_date'],
+                condition=models.Q(recurring=True),
+                name='txn_recurring_due_idx',
+            ),
+        ]
+        constraints = [
+            # One generated row per template and occurrence date, so reruns are safe
+            models.UniqueConstraint(fields=['recurrence_source', 'date'], name='txn_unique_occurrence'),
+        ]
+
     def __str__(self):
         return f"{self.get_transaction_type_display()} of {self.amount} on {self.date}"
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so writes can adjust aggregates by delta
+        instance._loaded_values = {
+            field.attname: instance.__dict__[field.attname]
+            for field in cls._meta.concrete_fields
+            if field.attname in instance.__dict__
+        }
+        return instance
+
     def get_absolute_url(self):
         return reverse('transaction-detail', kwargs={'pk': self.pk})
 
+class SearchDocumentField(models.TextField):
+    """The FTS5 hidden column named after its table, which supports ``__match``."""
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class TransactionSearchIndex(models.Model):
+    """Read-only mapping of the SQLite FTS5 table kept in sync by triggers (migration 0004)."""
+    transaction = models.OneToOneField(
+        Transaction, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_index',
+    )
+    description = models.TextField()
+    category = models.TextField()
+    document = SearchDocumentField(db_column='expenses_transaction_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'expenses_transaction_fts'
+
+class BudgetQuerySet(models.QuerySet):
+    LIST_FIELDS = ('category__name', 'amount', 'start_date', 'end_date', 'is_active', 'spent', 'transaction_count')
+
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def for_list(self):
+        """Join the category and load only the columns budget listings use."""
+        return self.select_related('category').only(*self.LIST_FIELDS)
+
 class Budget(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
@@ -51,9 +140,69 @@ class Budget(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     is_active = models.BooleanField(default=True)
-    
+    # Expenses in the category and date window, maintained from Transaction
+    # writes (see budgets.apply_deltas) and checked by reconcile_budgets
+    spent = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    transaction_count = models.IntegerField(default=0, editable=False)
+
+    objects = BudgetQuerySet.as_manager()
+
     class Meta:
         unique_together = ('user', 'category', 'start_date', 'end_date')
-    
+
+    def __str__(self):
+        return f"{self.category} - {self.amount} ({self.start_date} to {self.end_date})"
+
+class MonthlyRollup(models.Model):
+    """Per-user monthly totals by category and type, maintained from Transaction writes."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    # Rows are folded into "uncategorized" by a pre_delete handler, see rollups.fold_category
+    category = models.ForeignKey(Category, on_delete=models.DO_NOTHING, null=True, blank=True)
+    transaction_type = models.CharField(max_length=2, choices=Transaction.TRANSACTION_TYPES)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['year', 'month']
+        unique_together = ('user', 'year', 'month', 'category', 'transaction_type')
+
+    def __str__(self):
+        return f"{self.user} {self.month}/{self.year} {self.category or 'Uncategorized'} {self.transaction_type}: {self.total}"
+
+class DataWatermark(models.Model):
+    """Bumped on every write to a user's transactions, categories or budgets (see watermarks).
+
+    The row without a user stands for the default categories and rollup
+    rebuilds, which every user sees.
+    """
+    # No database constraint, so the row may outlive its user: the cascaded
+    # deletes of a user's rows touch it while the user is being deleted
+    user = models.OneToOneField(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+'
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+    # Advanced only by category writes; keys the cached category choices
+    categories_version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id or 'everyone'} v{self.version} at {self.modified_at}"
+
+class RollupWatermark(models.Model):
+    """Bumped on every change to one month of a user's rollup rows (see rollups.touch_months).
+
+    Months never written have no row and count as version 0.
+    """
+    # No database constraint, for the same reason as DataWatermark.user
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'year', 'month')
+
     def __str__(self):
-        return f"{self.category} - {self.amount} ({self.start_date} to {self.end_date})"
\ No newline at end of file
+        return f"{self.user_id} {self.month}/{self.year} v{self.version}"
@@ -0,0 +1,204 @@
+import base64
+import binascii
+import inspect
+import json
+import operator
+from datetime import date
+from decimal import Decimal
+from functools import cached_property, reduce
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+
+
+class CursorPage:
+    """One page of a keyset-paginated queryset, iterable like a Django Page."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, estimated_count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.estimated_count = estimated_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _dump(value):
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'n': str(value)}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict):
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        return Decimal(value['n'])
+    return value
+
+
+class CursorPaginator:
+    """Keyset pagination, by default over ``(date, id)`` newest first.
+
+    Each page is a single indexed range query, so deep pages cost the same as
+    the first one. Cursors are opaque to clients: the encoded key of the
+    boundary row plus the direction to read from it. ``ordering`` must end in
+    a unique field; its fields may be annotations. No COUNT(*) is issued; pass
+    ``count_estimate`` (a callable) to show an approximate total instead.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page, count_estimate=None, ordering=('-date', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_estimate = count_estimate
+        self.ordering = list(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = [_dump(getattr(obj, field)) for field in self.fields]
+        raw = json.dumps([values, direction], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return ``(key values, direction)``, or None for a missing or malformed cursor."""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values, direction = json.loads(raw)
+            if len(values) != len(self.fields):
+                return None
+            return [_load(value) for value in values], direction
+        except (ValueError, TypeError, KeyError, binascii.Error):
+            return None
+
+    def _after(self, values, reverse=False):
+        # (a, b, c) "after" (x, y, z) in ordering: a beyond x, or a == x and b beyond y, ...
+        steps = []
+        for i, field in enumerate(self.ordering):
+            descending = field.startswith('-') != reverse
+            name = field.lstrip('-')
+            step = Q(**{f'{name}__{"lt" if descending else "gt"}': values[i]})
+            for prior, value in zip(self.fields[:i], values[:i]):
+                step &= Q(**{prior: value})
+            steps.append(step)
+        return reduce(operator.or_, steps)
+
+    def _query(self, cursor):
+        """Return ``(queryset, direction, keyed)`` for the rows of the page at ``cursor``."""
+        key = self.decode_cursor(cursor)
+        limit = self.per_page + 1
+
+        if key is None:
+            return self.queryset.order_by(*self.ordering)[:limit], self.NEXT, False
+
+        values, direction = key
+        if direction == self.PREVIOUS:
+            reverse_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+            queryset = self.queryset.filter(self._after(values, reverse=True)).order_by(*reverse_ordering)
+            return queryset[:limit], self.PREVIOUS, True
+
+        return self.queryset.filter(self._after(values)).order_by(*self.ordering)[:limit], self.NEXT, True
+
+    def _from_rows(self, rows, direction, keyed, estimated_count):
+        if direction == self.PREVIOUS:
+            # Reading backwards: "more" rows lie before this page
+            return self._page(rows[:self.per_page][::-1], True, len(rows) > self.per_page, estimated_count)
+        return self._page(rows[:self.per_page], len(rows) > self.per_page, keyed, estimated_count)
+
+    def get_page(self, cursor=None):
+        queryset, direction, keyed = self._query(cursor)
+        rows = list(queryset)
+        estimated_count = self.count_estimate() if self.count_estimate else None
+        return self._from_rows(rows, direction, keyed, estimated_count)
+
+    async def aget_page(self, cursor=None):
+        """Async get_page(); ``count_estimate`` may be a coroutine function."""
+        queryset, direction, keyed = self._query(cursor)
+        rows = [row async for row in queryset]
+        estimated_count = None
+        if self.count_estimate:
+            estimated_count = self.count_estimate()
+            if inspect.isawaitable(estimated_count):
+                estimated_count = await estimated_count
+        return self._from_rows(rows, direction, keyed, estimated_count)
+
+    def _page(self, rows, has_next, has_previous, estimated_count=None):
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], self.NEXT) if rows and has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], self.PREVIOUS) if rows and has_previous else None,
+            estimated_count=estimated_count,
+        )
+
+
+def estimated_row_count(model, using='default'):
+    """Row count of ``model``'s table from the database statistics, or None where there are none.
+
+    PostgreSQL keeps ``pg_class.reltuples`` (updated by ANALYZE/autovacuum),
+    MySQL ``information_schema.TABLES.TABLE_ROWS``; SQLite keeps nothing
+    usable without ANALYZE.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    # reltuples is -1 for a table that was never analyzed
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Page-number pagination that never counts more than ``max_count`` rows.
+
+    Up to ``max_count`` matches the count is exact. Beyond that an unfiltered
+    queryset reports the table estimate (estimated_row_count) and a filtered
+    one reports ``max_count``, so later pages are reached by narrowing the
+    filters. For the admin changelists of large tables, together with
+    ``show_full_result_count = False``.
+    """
+
+    max_count = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        # COUNT(*) over a LIMITed subquery stops reading at the limit
+        count = queryset.order_by()[:self.max_count + 1].count()
+        if count <= self.max_count:
+            return count
+        if not queryset.query.has_filters():
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None:
+                return max(estimate, count)
+        return self.max_count
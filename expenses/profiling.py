@@ -0,0 +1,176 @@
+import math
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+
+# Histogram buckets grow by 2**(1/8), about 9%, from 0.01 ms; percentiles are
+# reported as the upper edge of their bucket
+BUCKET_BASE = 0.01
+BUCKET_GROWTH = 2 ** (1 / 8)
+PERCENTILES = (50, 95, 99)
+
+# The metrics of the request being handled, set by PerformanceMiddleware
+current = ContextVar('expenses_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_time', 'template_time', 'peak_memory')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.peak_memory = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook timing every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper of every connection, timing the query into the current request's metrics."""
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrument(sender, connection, **kwargs):
+    """Install record_query on each connection as it is opened, whichever thread opens it.
+
+    Async views run their ORM calls in sync_to_async threads, which have
+    connections of their own; ``current`` is copied into those threads, so
+    their queries still count toward the request.
+    """
+    if record_query not in connection.execute_wrappers:
+        # First, so execute_wrapper() blocks still pop their own wrapper
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class Histogram:
+    """Log-bucketed distribution of non-negative values, in constant memory per bucket."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        index = math.ceil(math.log(value / BUCKET_BASE, BUCKET_GROWTH)) if value > BUCKET_BASE else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(BUCKET_BASE * BUCKET_GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self):
+        summary = {f'p{percent}': _round(self.percentile(percent)) for percent in PERCENTILES}
+        summary.update(mean=_round(self.total / self.count if self.count else None), max=_round(self.max))
+        return summary
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class ViewStats:
+    """Distributions of one URL name's requests; times in milliseconds."""
+    METRICS = ('wall_ms', 'db_ms', 'template_ms', 'queries')
+
+    def __init__(self):
+        self.histograms = {metric: Histogram() for metric in self.METRICS}
+        self.peak_memory_kb = Histogram()
+
+    def add(self, wall_time, metrics):
+        self.histograms['wall_ms'].add(wall_time * 1000)
+        self.histograms['db_ms'].add(metrics.db_time * 1000)
+        self.histograms['template_ms'].add(metrics.template_time * 1000)
+        self.histograms['queries'].add(metrics.queries)
+        if metrics.peak_memory is not None:
+            self.peak_memory_kb.add(metrics.peak_memory / 1024)
+
+    def summary(self):
+        summary = {'requests': self.histograms['wall_ms'].count}
+        summary.update((metric, histogram.summary()) for metric, histogram in self.histograms.items())
+        if self.peak_memory_kb.count:
+            summary['peak_memory_kb'] = {'samples': self.peak_memory_kb.count, **self.peak_memory_kb.summary()}
+        return summary
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(view_name, wall_time, metrics):
+    with _lock:
+        stats = _stats.get(view_name)
+        if stats is None:
+            stats = _stats[view_name] = ViewStats()
+        stats.add(wall_time, metrics)
+
+
+def snapshot():
+    """Per URL name summaries of this process's requests, slowest p95 first."""
+    with _lock:
+        summaries = {name: stats.summary() for name, stats in _stats.items()}
+    return dict(sorted(summaries.items(), key=lambda item: -(item[1]['wall_ms']['p95'] or 0)))
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+class TimedTemplate:
+    """Backend template that adds its render time to the current request's metrics.
+
+    Only templates rendered through the backend (render(), TemplateResponse)
+    are wrapped, so included templates are not counted twice.
+    """
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = current.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render times reported to PerformanceMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
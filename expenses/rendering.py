@@ -0,0 +1,59 @@
+"""Chart renderers, run in the chart pool's worker processes.
+
+They use the object-oriented Figure API only, never pyplot's global state,
+and return PNG bytes. This module is imported lazily by charts.render.
+"""
+import io
+
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+
+
+def _png(figure):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_monthly(labels, income, expenses):
+    figure = Figure(figsize=(12, 6))
+    ax = figure.subplots()
+    x = range(len(labels))
+    width = 0.35
+
+    ax.bar([i - width/2 for i in x], income, width, label='Income', color='#28a745', alpha=0.8)
+    ax.bar([i + width/2 for i in x], expenses, width, label='Expenses', color='#dc3545', alpha=0.8)
+
+    ax.set_title('Monthly Income vs Expenses', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Amount ($)', fontsize=12)
+    ax.set_xticks(list(x), labels, rotation=45)
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    figure.tight_layout()
+    return _png(figure)
+
+
+def render_category(labels, amounts):
+    figure = Figure(figsize=(10, 8))
+    ax = figure.subplots()
+
+    _, _, autotexts = ax.pie(
+        amounts,
+        labels=labels,
+        colors=colormaps['Set3'](range(len(labels))),
+        autopct='%1.1f%%',
+        startangle=90,
+        textprops={'fontsize': 10}
+    )
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    ax.set_title('Expenses by Category', fontsize=16, fontweight='bold', pad=20)
+    ax.axis('equal')
+    figure.tight_layout()
+    return _png(figure)
+
+
+RENDERERS = {'monthly': render_monthly, 'category': render_category}
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import caches
+
+# Cache alias for report results; its TIMEOUT and MAX_ENTRIES bound age and size
+CACHE_ALIAS = getattr(settings, 'EXPENSES_REPORT_CACHE', 'default')
+
+REPORT_KEY = 'expenses:report:{name}:{user_id}:{start}:{end}:{version}'
+STAT_KEYS = {'hits': 'expenses:report-cache:hits', 'misses': 'expenses:report-cache:misses'}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def data_version(user_id):
+    """Token that changes whenever data shown in the user's reports changes.
+
+    The user's watermark version (see watermarks), read from the database,
+    so every process stops using a report as soon as any of them writes.
+    """
+    # Imported here: chart render workers load this module before the app registry
+    from . import watermarks
+    return watermarks.state(user_id)[0]
+
+
+def _count(cache, stat):
+    key = STAT_KEYS[stat]
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, None)
+
+
+def get_or_build(user, start_date, end_date, build, name='page'):
+    """Return the cached report for ``(name, user, date range, data version)``, building it on a miss.
+
+    ``build`` is only called on a miss and must return a picklable value.
+    """
+    cache = get_cache()
+    key = REPORT_KEY.format(
+        name=name, user_id=user.pk, start=start_date.isoformat(), end=end_date.isoformat(), version=data_version(user.pk)
+    )
+    report = cache.get(key)
+    if report is not None:
+        _count(cache, 'hits')
+        return report
+    _count(cache, 'misses')
+    report = build()
+    cache.set(key, report)
+    return report
+
+
+def stats():
+    cache = get_cache()
+    counts = {stat: cache.get(key) or 0 for stat, key in STAT_KEYS.items()}
+    lookups = counts['hits'] + counts['misses']
+    counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else None
+    return counts
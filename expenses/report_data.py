@@ -0,0 +1,15 @@
+# Daily series longer than this are summed into multi-day buckets
+DEFAULT_POINTS = 400
+MAX_POINTS = 2000
+
+SERIES = ('daily', 'categories', 'monthly')
+
+
+def summary(user, start_date, end_date, max_points=DEFAULT_POINTS):
+    """Every series in SERIES for the range, keyed by name.
+
+    Computed by the analytics module from one grouped query; it is imported
+    here so NumPy is only loaded once a report is actually built.
+    """
+    from .analytics import report_series
+    return report_series(user, start_date, end_date, max_points)
@@ -0,0 +1,203 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import MonthlyRollup, RollupWatermark, Transaction
+
+CENTS = Decimal('0.01')
+KEY_FIELDS = ('user_id', 'year', 'month', 'category_id', 'transaction_type')
+
+
+def touch_months(months):
+    """Advance the versions of ``(user_id, year, month)`` months (see RollupWatermark).
+
+    Missing rows are first inserted at version 0, skipping any a concurrent
+    write inserted meanwhile, so every write advances the version once.
+    """
+    months = sorted(set(months))
+    if not months:
+        return
+    RollupWatermark.objects.bulk_create(
+        [RollupWatermark(user_id=user_id, year=year, month=month) for user_id, year, month in months],
+        ignore_conflicts=True,
+    )
+    grouped = defaultdict(list)
+    for user_id, year, month in months:
+        grouped[user_id, year].append(month)
+    condition = Q()
+    for (user_id, year), numbers in grouped.items():
+        condition |= Q(user_id=user_id, year=year, month__in=numbers)
+    RollupWatermark.objects.filter(condition).update(version=F('version') + 1)
+
+
+def month_versions(user, months):
+    """``{(year, month): version}`` of ``months`` of the user's rollups, in one query."""
+    years = [year for year, _ in months]
+    rows = RollupWatermark.objects.filter(user=user, year__range=(min(years), max(years))).values_list(
+        'year', 'month', 'version'
+    )
+    versions = {(year, month): version for year, month, version in rows}
+    return {month: versions.get(month, 0) for month in months}
+
+
+def apply_deltas(deltas):
+    """Fold TransactionDelta records into the monthly rollup rows.
+
+    Existing rows are looked up in one query and incremented in one
+    ``executemany``, so a large bulk write costs a handful of statements
+    rather than one per rollup key. Missing rows are first inserted empty,
+    skipping any a concurrent write inserted meanwhile, and then incremented
+    like the others.
+    """
+    folded = defaultdict(lambda: [Decimal('0'), 0])
+    for delta in deltas:
+        key = (delta.user_id, delta.date.year, delta.date.month, delta.category_id, delta.transaction_type)
+        folded[key][0] += delta.amount
+        folded[key][1] += delta.count
+    folded = {key: change for key, change in folded.items() if change[0] or change[1]}
+    if not folded:
+        return
+
+    years = [key[1] for key in folded]
+    rows = MonthlyRollup.objects.filter(
+        user_id__in={key[0] for key in folded}, year__range=(min(years), max(years))
+    ).values_list('pk', *KEY_FIELDS)
+    with transaction.atomic():
+        existing = {tuple(row[1:]): row[0] for row in rows}
+        missing = [key for key, (_, count) in folded.items() if key not in existing and count > 0]
+        if missing:
+            MonthlyRollup.objects.bulk_create(
+                [MonthlyRollup(total=0, count=0, **dict(zip(KEY_FIELDS, key))) for key in missing],
+                ignore_conflicts=True,
+            )
+            existing = {tuple(row[1:]): row[0] for row in rows.all()}
+
+        updates, shrunk = [], []
+        for key, (amount, count) in folded.items():
+            pk = existing.get(key)
+            if pk is not None:
+                updates.append((amount, count, pk))
+                if count < 0:
+                    shrunk.append(pk)
+
+        if updates:
+            quote = connection.ops.quote_name
+            with connection.cursor() as cursor:
+                # ROUND keeps SQLite, which adds decimals as floats, at whole cents
+                cursor.executemany(
+                    f"UPDATE {quote(MonthlyRollup._meta.db_table)} "
+                    f"SET {quote('total')} = ROUND({quote('total')} + %s, 2), "
+                    f"{quote('count')} = {quote('count')} + %s "
+                    f"WHERE {quote('id')} = %s",
+                    updates,
+                )
+        if shrunk:
+            MonthlyRollup.objects.filter(pk__in=shrunk, count__lte=0).delete()
+        touch_months(key[:3] for key in folded)
+
+
+def fold_category(category):
+    """Move a category's rollups to "uncategorized" before the category is deleted."""
+    with transaction.atomic():
+        rows = list(MonthlyRollup.objects.filter(category=category))
+        touch_months((row.user_id, row.year, row.month) for row in rows)
+        for row in rows:
+            merged = MonthlyRollup.objects.filter(
+                user_id=row.user_id, year=row.year, month=row.month,
+                category__isnull=True, transaction_type=row.transaction_type,
+            ).update(total=F('total') + row.total, count=F('count') + row.count)
+            if merged:
+                row.delete()
+            else:
+                MonthlyRollup.objects.filter(pk=row.pk).update(category=None)
+
+
+def aggregate_transactions(user=None):
+    """Compute the rollup rows straight from Transaction, grouped by rollup key."""
+    queryset = Transaction.objects.all() if user is None else Transaction.objects.filter(user=user)
+    return (
+        queryset.order_by()
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values(*KEY_FIELDS)
+        .annotate(total=Sum('amount'), rows=Count('id'))
+    )
+
+
+def rebuild(user=None):
+    """Replace the rollup rows (for one user, or everyone) with freshly computed ones."""
+    rows = [
+        MonthlyRollup(total=row['total'], count=row['rows'], **{field: row[field] for field in KEY_FIELDS})
+        for row in aggregate_transactions(user)
+    ]
+    with transaction.atomic():
+        existing = MonthlyRollup.objects.all() if user is None else MonthlyRollup.objects.filter(user=user)
+        months = set(existing.order_by().values_list('user_id', 'year', 'month').distinct())
+        existing.delete()
+        MonthlyRollup.objects.bulk_create(rows, batch_size=1000)
+        touch_months(months | {(row.user_id, row.year, row.month) for row in rows})
+    return len(rows)
+
+
+def verify(user=None):
+    """Return ``(key, expected, actual)`` for every rollup row that has drifted.
+
+    ``expected`` and ``actual`` are ``(total, count)`` pairs, ``None`` when the
+    row is missing on that side.
+    """
+    # SQLite sums decimals as floats; round to the stored precision
+    expected = {
+        tuple(row[field] for field in KEY_FIELDS): (row['total'].quantize(CENTS), row['rows'])
+        for row in aggregate_transactions(user)
+    }
+    stored = MonthlyRollup.objects.all() if user is None else MonthlyRollup.objects.filter(user=user)
+    actual = {
+        tuple(row[field] for field in KEY_FIELDS): (row['total'], row['count'])
+        for row in stored.values(*KEY_FIELDS, 'total', 'count')
+    }
+    drift = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        if expected.get(key) != actual.get(key):
+            drift.append((key, expected.get(key), actual.get(key)))
+    return drift
+
+
+def _period(user, start_date, end_date):
+    return MonthlyRollup.objects.filter(
+        Q(year__gt=start_date.year) | Q(year=start_date.year, month__gte=start_date.month),
+        Q(year__lt=end_date.year) | Q(year=end_date.year, month__lte=end_date.month),
+        user=user,
+    ).order_by()
+
+
+async def aperiod_totals(user, start_date, end_date):
+    """Income and expense totals for whole months, keyed by transaction type, in one aggregate."""
+    totals = await _period(user, start_date, end_date).aaggregate(**{
+        transaction_type: Sum('total', filter=Q(transaction_type=transaction_type))
+        for transaction_type in (Transaction.INCOME, Transaction.EXPENSE)
+    })
+    return {transaction_type: amount or Decimal('0') for transaction_type, amount in totals.items()}
+
+
+def _estimate_rows(user, start_date=None, end_date=None, category=None, transaction_type=None):
+    rows = MonthlyRollup.objects.filter(user=user).order_by()
+    if start_date:
+        rows = rows.filter(Q(year__gt=start_date.year) | Q(year=start_date.year, month__gte=start_date.month))
+    if end_date:
+        rows = rows.filter(Q(year__lt=end_date.year) | Q(year=end_date.year, month__lte=end_date.month))
+    if category:
+        rows = rows.filter(category=category)
+    if transaction_type:
+        rows = rows.filter(transaction_type=transaction_type)
+    return rows
+
+
+async def aestimate_count(user, **filters):
+    """Approximate number of transactions matching the list filters.
+
+    Exact when no date bounds are given; otherwise every month touched by the
+    range counts in full.
+    """
+    return (await _estimate_rows(user, **filters).aaggregate(total=Sum('count')))['total'] or 0
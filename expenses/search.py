@@ -0,0 +1,207 @@
+import re
+import shlex
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Category, Transaction
+
+FTS_TABLE = 'expenses_transaction_fts'
+
+OPERATOR_RE = re.compile(r'^(amount|cat|category|type|before|after|on):(.+)$', re.IGNORECASE)
+AMOUNT_RE = re.compile(r'^(>=|<=|>|<|=)?(\d+(?:\.\d{1,2})?)$')
+AMOUNT_LOOKUPS = {'>': 'gt', '>=': 'gte', '<': 'lt', '<=': 'lte', '=': 'exact', None: 'exact'}
+TYPE_ALIASES = {
+    'in': Transaction.INCOME, 'income': Transaction.INCOME,
+    'ex': Transaction.EXPENSE, 'expense': Transaction.EXPENSE, 'expenses': Transaction.EXPENSE,
+}
+
+
+def _amount_filter(value):
+    match = AMOUNT_RE.match(value)
+    if not match:
+        return None
+    try:
+        amount = Decimal(match.group(2))
+    except InvalidOperation:
+        return None
+    return Q(**{f'amount__{AMOUNT_LOOKUPS[match.group(1)]}': amount})
+
+
+def _categories(user):
+    """The categories ``user`` can search by: their own and the defaults (all of them without a user)."""
+    return Category.objects.all() if user is None else Category.objects.filter(Q(user=user) | Q(is_default=True))
+
+
+def _operator_filter(user, name, value):
+    name = name.lower()
+    if name == 'amount':
+        return _amount_filter(value)
+    if name in ('cat', 'category'):
+        return Q(category__in=_categories(user).filter(name__iexact=value))
+    if name == 'type':
+        transaction_type = TYPE_ALIASES.get(value.lower())
+        return Q(transaction_type=transaction_type) if transaction_type else None
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return Q(**{{'before': 'date__lt', 'after': 'date__gt', 'on': 'date'}[name]: day})
+
+
+def parse_query(text, user):
+    """Split a search string into free-text terms and a Q of structured filters.
+
+    Supported operators: ``amount:>100`` (also ``>=``, ``<``, ``<=``, ``=``),
+    ``cat:food``, ``type:income``, ``before:2025-01-01``, ``after:...`` and
+    ``on:...``. A bare number matches the amount exactly; quoted strings are
+    phrases. Tokens that fail to parse are searched as text.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+
+    terms, filters = [], Q()
+    for token in tokens:
+        operator = OPERATOR_RE.match(token)
+        condition = _operator_filter(user, *operator.groups()) if operator else _amount_filter(token)
+        if condition is None:
+            terms.append(token)
+        else:
+            filters &= condition
+    return terms, filters
+
+
+class BasicSearchBackend:
+    """Unindexed fallback: case-insensitive substring matching."""
+
+    ordering = ('-date', '-id')
+
+    def search(self, queryset, terms, user=None):
+        for term in terms:
+            queryset = queryset.filter(Q(description__icontains=term) | Q(category__name__icontains=term))
+        return queryset
+
+    def prefix_filter(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(description__istartswith=term)
+        return queryset
+
+
+class SQLiteFTSBackend:
+    """SQLite FTS5 over description and category name, ranked by bm25.
+
+    The ``expenses_transaction_fts`` table is kept in sync by triggers created
+    in migration 0004, so bulk writes are indexed too.
+    """
+
+    ordering = ('rank', '-date', '-id')
+
+    @staticmethod
+    def is_available():
+        return FTS_TABLE in _table_names()
+
+    @staticmethod
+    def match_expression(terms):
+        # Quote every term so user input cannot inject FTS5 syntax; * makes it a prefix query
+        return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+    def search(self, queryset, terms, user=None):
+        # Joins the FTS table so SQLite drives the query from the MATCH and
+        # reads bm25 from its hidden rank column
+        return self.prefix_filter(queryset, terms).annotate(rank=F('search_index__rank'))
+
+    def prefix_filter(self, queryset, terms):
+        return queryset.filter(search_index__document__match=self.match_expression(terms))
+
+
+class PostgresSearchBackend:
+    """PostgreSQL tsvector search over description, ranked by ts_rank.
+
+    Uses the GIN expression index from migration 0004; the vector expression
+    below must stay identical to the indexed one. Category names are looked
+    up first in the (small) category table, so the transaction query only
+    adds an ``IN`` on the indexed category column to the vector match.
+    """
+
+    ordering = ('rank', '-date', '-id')
+    vector = "to_tsvector('simple', coalesce(description, ''))"
+
+    @staticmethod
+    def tsquery(terms):
+        lexemes = []
+        for term in terms:
+            words = re.findall(r'\w+', term)
+            if words:
+                lexemes.append(' <-> '.join(words) + ':*')
+        return ' & '.join(lexemes)
+
+    def matches(self, query):
+        return RawSQL(f"{self.vector} @@ to_tsquery('simple', %s)", [query], output_field=BooleanField())
+
+    @staticmethod
+    def category_ids(terms, user):
+        """Ids of the categories ``user`` can see whose names contain every term."""
+        categories = _categories(user)
+        for term in terms:
+            categories = categories.filter(name__icontains=term)
+        return list(categories.values_list('pk', flat=True))
+
+    def search(self, queryset, terms, user=None):
+        query = self.tsquery(terms)
+        if not query:
+            return queryset.none()
+        condition = Q(self.matches(query))
+        category_ids = self.category_ids(terms, user)
+        if category_ids:
+            condition |= Q(category_id__in=category_ids)
+        return queryset.filter(condition).annotate(rank=RawSQL(
+            f"-ts_rank({self.vector}, to_tsquery('simple', %s))", [query], output_field=FloatField()
+        ))
+
+    def prefix_filter(self, queryset, terms):
+        query = self.tsquery(terms)
+        return queryset.filter(self.matches(query)) if query else queryset.none()
+
+
+@lru_cache(maxsize=None)
+def _table_names():
+    return frozenset(connection.introspection.table_names())
+
+
+def get_backend():
+    path = getattr(settings, 'EXPENSES_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite' and SQLiteFTSBackend.is_available():
+        return SQLiteFTSBackend()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return BasicSearchBackend()
+
+
+def prefix_filter(queryset, text, backend=None):
+    """Filter ``queryset`` to transactions with words starting with every term of ``text``.
+
+    Unlike search_transactions() it is not scoped to a user, parses no
+    operators and neither ranks nor joins categories, so the full-text index
+    alone answers it: the admin searches the whole table this way.
+    """
+    return (backend or get_backend()).prefix_filter(queryset, text.split())
+
+
+def search_transactions(user, text, backend=None):
+    """Return ``(queryset, ordering)`` for a search string; pass ``ordering`` to CursorPaginator."""
+    terms, filters = parse_query(text, user)
+    queryset = Transaction.objects.for_user(user).filter(filters).for_list()
+    if not terms:
+        return queryset, ('-date', '-id')
+    backend = backend or get_backend()
+    return backend.search(queryset, terms, user), backend.ordering
@@ -0,0 +1,141 @@
+import math
+import random
+from calendar import monthrange
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from . import budgets, rollups
+from .models import Budget, Category, Transaction
+from .recurring import add_months
+
+# Per category: share of a user's transactions, median amount, spread (sigma
+# of the log-normal amount), type and the payees descriptions are drawn from
+CATEGORY_PROFILES = {
+    'Food': (0.38, 18, 0.6, Transaction.EXPENSE, ['Grocery store', 'Cafe', 'Restaurant', 'Bakery', 'Takeaway']),
+    'Shopping': (0.18, 45, 0.9, Transaction.EXPENSE, ['Online order', 'Clothing store', 'Electronics', 'Bookshop']),
+    'Entertainment': (0.12, 30, 0.7, Transaction.EXPENSE, ['Cinema', 'Streaming', 'Concert', 'Games']),
+    'Health': (0.07, 60, 0.8, Transaction.EXPENSE, ['Pharmacy', 'Dentist', 'Gym']),
+    'Utilities': (0.08, 90, 0.3, Transaction.EXPENSE, ['Electricity', 'Water', 'Internet', 'Phone']),
+    'Travel': (0.05, 250, 0.8, Transaction.EXPENSE, ['Airline', 'Hotel', 'Train', 'Car rental']),
+    'Rent': (0.04, 1400, 0.1, Transaction.EXPENSE, ['Landlord']),
+    'Salary': (0.08, 3200, 0.15, Transaction.INCOME, ['Employer payroll', 'Freelance client']),
+}
+CATEGORY_NAMES = list(CATEGORY_PROFILES)
+# Share of transactions left without a category
+UNCATEGORIZED_SHARE = 0.03
+# Monthly templates each user gets, due within the last four weeks
+RECURRING_CATEGORIES = ['Rent', 'Salary', 'Utilities']
+BUDGET_CATEGORIES = ['Food', 'Shopping', 'Entertainment']
+
+
+def _amount(rng, median, spread):
+    return max(Decimal(round(rng.lognormvariate(0, spread) * median * 100)) / 100, Decimal('0.01'))
+
+
+def seed_transactions(users=100, transactions_per_user=10000, days=3 * 365,
+                      batch_size=5000, prefix='bench', rng=None, recurring=True, budget_months=0):
+    """Bulk-insert synthetic users, categories and transactions for benchmarking.
+
+    Categories, amounts and payees follow CATEGORY_PROFILES and dates are
+    spread over the last ``days`` days. With ``recurring``, each user also
+    gets monthly RECURRING_CATEGORIES templates that are due, and with
+    ``budget_months`` a monthly budget per BUDGET_CATEGORIES for that many
+    months up to the current one, sized around the seeded spending.
+
+    Returns the created users. Rollups and budget counters are rebuilt once
+    at the end since bulk_create bypasses the per-row signal handlers.
+    """
+    rng = rng or random.Random(0)
+    today = timezone.now().date()
+
+    existing = User.objects.filter(username__startswith=f'{prefix}_').count()
+    User.objects.bulk_create([
+        User(username=f'{prefix}_{existing + i}', password='!')
+        for i in range(users)
+    ])
+    created_users = list(User.objects.filter(username__startswith=f'{prefix}_').order_by('-id')[:users])
+
+    Category.objects.bulk_create([
+        Category(user=user, name=name) for user in created_users for name in CATEGORY_NAMES
+    ])
+    categories = {}
+    for category_id, user_id, name in Category.objects.filter(user__in=created_users).values_list(
+            'id', 'user_id', 'name'):
+        categories.setdefault(user_id, {})[name] = category_id
+
+    profiles = list(CATEGORY_PROFILES.items())
+    cum_weights = list(accumulate(share for _, (share, *_) in profiles))
+    batch = []
+
+    def add(transaction):
+        batch.append(transaction)
+        if len(batch) >= batch_size:
+            Transaction.objects.bulk_create(batch)
+            batch.clear()
+
+    for user in created_users:
+        user_categories = categories[user.id]
+        for name, (_, median, spread, transaction_type, payees) in rng.choices(
+                profiles, cum_weights=cum_weights, k=transactions_per_user):
+            income = transaction_type == Transaction.INCOME
+            add(Transaction(
+                user_id=user.id,
+                amount=_amount(rng, median, spread),
+                category_id=None if rng.random() < UNCATEGORIZED_SHARE else user_categories[name],
+                date=today - timedelta(days=rng.randrange(days)),
+                description=f'{rng.choice(payees)} - synthetic {"income" if income else "expense"} '
+                            f'{rng.randrange(10000)}',
+                transaction_type=transaction_type,
+            ))
+        if recurring:
+            for name in RECURRING_CATEGORIES:
+                _, median, _, transaction_type, payees = CATEGORY_PROFILES[name]
+                next_date = today - timedelta(days=rng.randrange(28))
+                add(Transaction(
+                    user_id=user.id,
+                    amount=Decimal(median),
+                    category_id=user_categories[name],
+                    date=add_months(next_date, -1),
+                    description=f'{payees[0]} - monthly',
+                    transaction_type=transaction_type,
+                    recurring=True,
+                    recurrence_frequency='monthly',
+                    next_recurrence_date=next_date,
+                ))
+    if batch:
+        Transaction.objects.bulk_create(batch)
+
+    if budget_months:
+        seed_budgets(created_users, categories, transactions_per_user / max(days / 30.4, 1), budget_months, rng)
+
+    for user in created_users:
+        rollups.rebuild(user)
+        if budget_months:
+            budgets.reconcile(user)
+    return created_users
+
+
+def seed_budgets(users, categories, transactions_per_month, months, rng):
+    """Monthly budgets per BUDGET_CATEGORIES, within about 20% of the expected spending."""
+    today = timezone.now().date()
+    budgets = []
+    for user in users:
+        for name in BUDGET_CATEGORIES:
+            share, median, spread, _, _ = CATEGORY_PROFILES[name]
+            # Mean of the log-normal amount times the expected number of rows
+            expected = transactions_per_month * share * median * math.exp(spread ** 2 / 2)
+            for months_back in range(months):
+                start = add_months(today.replace(day=1), -months_back)
+                budgets.append(Budget(
+                    user=user,
+                    category_id=categories[user.id][name],
+                    amount=Decimal(round(expected * rng.uniform(0.8, 1.2) * 100)) / 100,
+                    start_date=start,
+                    end_date=start.replace(day=monthrange(start.year, start.month)[1]),
+                ))
+    Budget.objects.bulk_create(budgets, batch_size=1000)
+    return budgets
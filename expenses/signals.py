@@ -0,0 +1,149 @@
+import logging
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from . import budgets, rollups, watermarks
+from .models import Budget, Category, Transaction
+
+# One signed contribution of a group of transactions to the derived aggregates.
+# ``amount`` and ``count`` are negative when rows leave the group.
+TransactionDelta = namedtuple(
+    'TransactionDelta',
+    ['user_id', 'date', 'category_id', 'transaction_type', 'amount', 'count'],
+)
+
+TRACKED_FIELDS = ('user_id', 'date', 'category_id', 'transaction_type', 'amount')
+
+# Sent whenever transactions are added, removed or moved between groups, with
+# ``deltas`` (a list of TransactionDelta). Write paths that bypass model
+# signals (bulk_create, QuerySet.update) must send it themselves.
+transactions_changed = Signal()
+
+# Sent once the write commits, with ``budget_ids``: the active budgets a
+# transaction write pushed over their amount.
+budget_exceeded = Signal()
+
+logger = logging.getLogger(__name__)
+
+
+def _state(values):
+    return tuple(values[field] for field in TRACKED_FIELDS)
+
+
+def _loaded_state(instance):
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or any(field not in loaded for field in TRACKED_FIELDS):
+        return None
+    return _state(loaded)
+
+
+def _current_state(instance):
+    values = {field: getattr(instance, field) for field in TRACKED_FIELDS}
+    # Unsaved values may still be e.g. the datetime from the field default
+    for field in ('date', 'amount'):
+        values[field] = Transaction._meta.get_field(field).to_python(values[field])
+    return _state(values)
+
+
+def state_deltas(old, new):
+    deltas = []
+    if old == new:
+        return deltas
+    if old is not None:
+        user_id, date, category_id, transaction_type, amount = old
+        deltas.append(TransactionDelta(user_id, date, category_id, transaction_type, -amount, -1))
+    if new is not None:
+        user_id, date, category_id, transaction_type, amount = new
+        deltas.append(TransactionDelta(user_id, date, category_id, transaction_type, amount, 1))
+    return deltas
+
+
+def created_deltas(transactions):
+    """Deltas for newly inserted rows, for bulk_create callers."""
+    return [delta for instance in transactions for delta in state_deltas(None, _current_state(instance))]
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_transaction_state(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding:
+        instance._previous_state = None
+        return
+    previous = _loaded_state(instance)
+    if previous is None:
+        stored = Transaction.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+        previous = _state(stored) if stored else None
+    instance._previous_state = previous
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_saved(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    current = _current_state(instance)
+    deltas = state_deltas(getattr(instance, '_previous_state', None), current)
+    instance._loaded_values = dict(zip(TRACKED_FIELDS, current))
+    if deltas:
+        transactions_changed.send(sender=Transaction, deltas=deltas)
+    else:
+        # No aggregate moved, but pages still show e.g. the new description
+        watermarks.touch([instance.user_id])
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_deleted(sender, instance, **kwargs):
+    deltas = state_deltas(_loaded_state(instance) or _current_state(instance), None)
+    transactions_changed.send(sender=Transaction, deltas=deltas)
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # Transaction.category is SET_NULL, which Django applies with a plain
+    # UPDATE, so move the category's rollups to "uncategorized" here.
+    rollups.fold_category(instance)
+
+
+@receiver(transactions_changed)
+def update_monthly_rollups(sender, deltas, **kwargs):
+    rollups.apply_deltas(deltas)
+
+
+@receiver(transactions_changed)
+def update_budget_spent(sender, deltas, **kwargs):
+    exceeded = budgets.apply_deltas(deltas)
+    if exceeded:
+        transaction.on_commit(lambda: budget_exceeded.send(sender=Budget, budget_ids=exceeded))
+
+
+@receiver(pre_save, sender=Budget)
+def count_budget_spent(sender, instance, raw, **kwargs):
+    # The window may have moved; budgets are saved rarely enough to recount
+    if not raw:
+        instance.spent, instance.transaction_count = budgets.compute(instance)
+
+
+@receiver(budget_exceeded)
+def log_budget_exceeded(sender, budget_ids, **kwargs):
+    for budget in Budget.objects.filter(pk__in=budget_ids).select_related('user', 'category'):
+        logger.info('Budget exceeded: %s spent %s of %s on %s', budget.user, budget.spent, budget.amount,
+                    budget.category)
+
+
+@receiver(transactions_changed)
+def advance_transaction_watermarks(sender, deltas, **kwargs):
+    watermarks.touch({delta.user_id for delta in deltas})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def advance_category_watermark(sender, instance, **kwargs):
+    # Default categories are everyone's choices, versioned on the row without a user
+    watermarks.touch([None if instance.is_default else instance.user_id], categories=True)
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+def advance_owner_watermark(sender, instance, **kwargs):
+    watermarks.touch([instance.user_id])
@@ -0,0 +1,24 @@
+/*
+ * Swaps every data-chart-src placeholder for its image once the server has
+ * rendered it. Charts render in the background, so the image URL answers
+ * 202 until the PNG is ready; poll it up to 30 times a second apart.
+ */
+document.querySelectorAll('[data-chart-src]').forEach(function (placeholder) {
+    var attempts = 0;
+    function load() {
+        fetch(placeholder.dataset.chartSrc, {credentials: 'same-origin'}).then(function (response) {
+            if (response.status === 202 && attempts++ < 30) {
+                setTimeout(load, 1000);
+            } else if (response.ok) {
+                var image = new Image();
+                image.src = placeholder.dataset.chartSrc;
+                image.alt = placeholder.dataset.chartAlt;
+                image.className = 'chart-image';
+                placeholder.replaceWith(image);
+            } else {
+                placeholder.textContent = 'Chart unavailable. Reload the page to try again.';
+            }
+        });
+    }
+    load();
+});
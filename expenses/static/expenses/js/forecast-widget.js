@@ -0,0 +1,65 @@
+/*
+ * Fills the dashboard forecast card from the forecast endpoint
+ * (forecast_view): the projected month-end spending, what was spent so far
+ * and the categories expected to cost the most.
+ */
+(function () {
+    'use strict';
+
+    var TOP_CATEGORIES = 3;
+
+    function money(value) {
+        return '$' + value.toFixed(2);
+    }
+
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function render(container, data) {
+        container.textContent = '';
+        if (!data.history.labels.length && !data.spent) {
+            container.appendChild(element('p', 'text-muted mb-0', 'Add transactions to see a forecast.'));
+            return;
+        }
+        container.appendChild(element('p', 'forecast-value', money(data.projected)));
+        container.appendChild(element('p', 'text-muted mb-1',
+            'projected by month end; ' + money(data.spent) + ' spent by day ' + data.day + ' of ' + data.days_in_month));
+        if (data.history.labels.length > 1) {
+            var direction = data.monthly_trend >= 0 ? 'up' : 'down';
+            container.appendChild(element('p', 'text-muted mb-0',
+                'Spending trends ' + direction + ' ' + money(Math.abs(data.monthly_trend)) + ' a month'));
+        }
+        var list = element('ul', 'forecast-categories');
+        data.categories.slice(0, TOP_CATEGORIES).forEach(function (category) {
+            var item = element('li');
+            item.appendChild(element('span', null, category.name));
+            item.appendChild(element('strong', null, money(category.projected)));
+            list.appendChild(item);
+        });
+        container.appendChild(list);
+    }
+
+    document.querySelectorAll('[data-forecast-url]').forEach(function (container) {
+        fetch(container.dataset.forecastUrl, {credentials: 'same-origin'})
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) {
+                render(container, data);
+            })
+            .catch(function () {
+                container.textContent = 'Forecast unavailable.';
+            });
+    });
+})();
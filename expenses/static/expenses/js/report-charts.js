@@ -0,0 +1,62 @@
+/*
+ * Renders the interactive report charts from the JSON series endpoints
+ * (report_data_view). Needs Plotly on the page; every element with
+ * data-chart and data-series-url becomes one chart.
+ */
+(function () {
+    'use strict';
+
+    var CONFIG = {responsive: true, displaylogo: false};
+    var LAYOUT = {margin: {t: 48, r: 16, b: 48, l: 56}, legend: {orientation: 'h'}};
+
+    function layout(title, extra) {
+        return Object.assign({title: {text: title}}, LAYOUT, extra || {});
+    }
+
+    var RENDERERS = {
+        daily: function (element, data) {
+            var title = data.bucket_days > 1
+                ? 'Income vs Expenses (' + data.bucket_days + '-day totals)'
+                : 'Income vs Expenses Over Time';
+            Plotly.newPlot(element, [
+                {x: data.labels, y: data.income, name: 'Income', type: 'scatter', mode: 'lines', line: {color: '#28a745'}},
+                {x: data.labels, y: data.expenses, name: 'Expenses', type: 'scatter', mode: 'lines', line: {color: '#dc3545'}}
+            ], layout(title, {yaxis: {title: {text: 'Amount'}}}), CONFIG);
+        },
+        categories: function (element, data) {
+            Plotly.newPlot(element, [
+                {labels: data.labels, values: data.totals, type: 'pie', hole: 0.35}
+            ], layout('Expenses by Category'), CONFIG);
+        },
+        monthly: function (element, data) {
+            Plotly.newPlot(element, [
+                {x: data.labels, y: data.income, name: 'Income', type: 'bar', marker: {color: '#28a745'}},
+                {x: data.labels, y: data.expenses, name: 'Expenses', type: 'bar', marker: {color: '#dc3545'}}
+            ], layout('Monthly Income vs Expenses', {barmode: 'group'}), CONFIG);
+        }
+    };
+
+    function load(element) {
+        var render = RENDERERS[element.dataset.chart];
+        fetch(element.dataset.seriesUrl, {credentials: 'same-origin'})
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) {
+                element.textContent = '';
+                if (!data.labels.length) {
+                    element.textContent = 'No data for this chart.';
+                    return;
+                }
+                render(element, data);
+            })
+            .catch(function () {
+                element.textContent = 'Chart unavailable. Reload the page to try again.';
+            });
+    }
+
+    document.querySelectorAll('[data-chart][data-series-url]').forEach(load);
+})();
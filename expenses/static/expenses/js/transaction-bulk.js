@@ -0,0 +1,44 @@
+/*
+ * Bulk actions on the transaction list: shows the input the chosen action
+ * needs, toggles every checkbox on the page, and asks before deleting or
+ * acting on every transaction that matches the filters.
+ */
+(function () {
+    'use strict';
+
+    var form = document.getElementById('bulk-form');
+    if (!form) {
+        return;
+    }
+    var action = form.elements.action;
+    var scope = form.elements.scope;
+    var checkboxes = document.querySelectorAll('input[name="selected"][form="bulk-form"]');
+
+    function showOptions() {
+        form.querySelectorAll('[data-bulk-option]').forEach(function (option) {
+            option.classList.toggle('active', option.dataset.bulkOption === action.value);
+        });
+    }
+
+    action.addEventListener('change', showOptions);
+    showOptions();
+
+    document.querySelectorAll('[data-bulk-select-all]').forEach(function (toggle) {
+        toggle.addEventListener('change', function () {
+            checkboxes.forEach(function (checkbox) {
+                checkbox.checked = toggle.checked;
+            });
+        });
+    });
+
+    form.addEventListener('submit', function (event) {
+        var target = scope.value === 'filtered'
+            ? 'every transaction matching the current filters'
+            : Array.prototype.filter.call(checkboxes, function (checkbox) { return checkbox.checked; }).length
+                + ' selected transactions';
+        var verb = action.value === 'delete' ? 'Delete ' : 'Apply this to ';
+        if ((action.value === 'delete' || scope.value === 'filtered') && !window.confirm(verb + target + '?')) {
+            event.preventDefault();
+        }
+    });
+})();
@@ -76,10 +76,19 @@ urlpatterns = [
     
     # Reports
     path('reports/', views.reports, name='reports'),
+    path('reports/data/<slug:series>.json', views.report_data_view, name='report-data'),
+    path('reports/charts/<slug:chart_id>.png', views.report_chart, name='report-chart'),
+    path('reports/forecast.json', views.forecast_view, name='report-forecast'),
+    path('reports/cache-stats/', views.report_cache_stats, name='report-cache-stats'),
+    path('performance/', views.performance_stats, name='performance-stats'),
     
     # Export
     path('export/', views.export_transactions, name='export-transactions'),
     
+    # Import
+    path('transactions/import/', views.import_transactions, name='transaction-import'),
+    path('transactions/bulk/', views.bulk_transactions, name='transaction-bulk'),
+    
     # Recurring transactions
     path('process-recurring/', views.process_recurring_transactions, name='process-recurring'),
     
@@ -1,48 +1,52 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
+from django.views.generic import View, ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
-from django.db.models import Sum, Q
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.template.loader import render_to_string
-from django.core.paginator import Paginator
 from django.views.decorators.http import require_POST
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
-from datetime import datetime, timedelta
-import pandas as pd
-import plotly.express as px
-import plotly.io as pio
+from datetime import date, datetime, timedelta
+from functools import partial
+import asyncio
 import json
+import logging
+from asgiref.sync import sync_to_async
 from django.contrib.auth import logout
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth import authenticate, login 
 
 from .models import Transaction, Category, Budget
+from .budgets import aget_budget_alerts, budget_progress
+from .categories import categories_for
+from .pagination import CursorPaginator
+from . import (bulk, charts, exports, forecasts, imports, profiling, recurring, report_cache, report_data, rollups,
+               search, watermarks)
 from .forms import (UserRegisterForm, UserLoginForm, TransactionForm, 
-                   CategoryForm, BudgetForm, TransactionFilterForm,AuthenticationForm)
+                   CategoryForm, BudgetForm, TransactionFilterForm, TransactionBulkForm, TransactionImportForm,
+                   AuthenticationForm)
 
-import matplotlib
-matplotlib.use('Agg')  # Required for backend rendering
-import matplotlib.pyplot as plt
-import io
-import base64
 from datetime import datetime, timedelta
-from django.db.models import Sum
-import seaborn as sns
+
+logger = logging.getLogger(__name__)
 
 # Authentication Views
 def register(request):
     if request.method == 'POST':
         form = UserRegisterForm(request.POST)
-        print("Form is valid?", form.is_valid())  # Debug
-        print("Form errors:", form.errors)  # Debug
         
         if form.is_valid():
             user = form.save()
-            print("User created:", user.username)  # Debug
+            logger.info("User registered: %s", user.username)
             messages.success(request, 'Registration successful!')
             return redirect('login')  # Redirect to login page
         else:
@@ -85,49 +89,38 @@ def custom_login(request):
 def home(request):
     return render(request, 'expenses/home.html')
 
-def dashboard(request):
+async def _request_user(request):
+    # Resolve the user without blocking the event loop, and keep it on the
+    # request so templates and context processors don't look it up synchronously
+    request.user = await request.auser()
+    return request.user
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+def _today(request):
+    # Pages showing "this month" change at midnight without any write
+    return timezone.now().date()
+
+@login_required
+@watermarks.conditional_page(_today)
+async def dashboard(request):
+    user = await _request_user(request)
     today = timezone.now().date()
     start_of_month = today.replace(day=1)
     end_of_month = (start_of_month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
     
-    # Calculate totals
-    income = Transaction.objects.filter(
-        user=request.user, 
-        transaction_type='IN',
-        date__range=[start_of_month, end_of_month]
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
-    
-    expenses = Transaction.objects.filter(
-        user=request.user, 
-        transaction_type='EX',
-        date__range=[start_of_month, end_of_month]
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
+    # Totals, recent transactions and budget alerts are independent queries
+    totals, recent_transactions, budget_alerts = await asyncio.gather(
+        rollups.aperiod_totals(user, start_of_month, end_of_month),
+        _alist(Transaction.objects.for_user(user).for_list().order_by('-date', '-id')[:5]),
+        aget_budget_alerts(user),
+    )
+    income = totals[Transaction.INCOME]
+    expenses = totals[Transaction.EXPENSE]
     
     balance = income - expenses
     
-    # Recent transactions
-    recent_transactions = Transaction.objects.filter(user=request.user).order_by('-date')[:5]
-    
-    # Budget alerts
-    budgets = Budget.objects.filter(user=request.user, is_active=True)
-    budget_alerts = []
-    
-    for budget in budgets:
-        spent = Transaction.objects.filter(
-            user=request.user,
-            category=budget.category,
-            transaction_type='EX',
-            date__range=[budget.start_date, budget.end_date]
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        if spent > budget.amount:
-            budget_alerts.append({
-                'category': budget.category,
-                'budget': budget.amount,
-                'spent': spent,
-                'overspent': spent - budget.amount
-            })
-    
     context = {
         'income': income,
         'expenses': expenses,
@@ -139,40 +132,54 @@ def dashboard(request):
     return render(request, 'expenses/dashboard.html', context)
 
 # Transaction Views
-class TransactionListView(LoginRequiredMixin, ListView):
-    model = Transaction
+@method_decorator(login_required, name='get')
+@method_decorator(watermarks.conditional_page(), name='get')
+class TransactionListView(View):
+    """Filterable, cursor-paginated transaction list, served asynchronously."""
     template_name = 'expenses/transaction_list.html'
-    context_object_name = 'transactions'
     paginate_by = 10
     
-    def get_queryset(self):
-        queryset = Transaction.objects.filter(user=self.request.user).order_by('-date')
+    show_estimated_count = True
+    
+    async def get(self, request, *args, **kwargs):
+        user = await _request_user(request)
+        queryset = Transaction.objects.for_user(user).for_list()
+        filters = {}
         
-        # Filtering
-        form = TransactionFilterForm(self.request.GET, user=self.request.user)
-        if form.is_valid():
-            data = form.cleaned_data
-            if data.get('start_date'):
-                queryset = queryset.filter(date__gte=data['start_date'])
-            if data.get('end_date'):
-                queryset = queryset.filter(date__lte=data['end_date'])
-            if data.get('category'):
-                queryset = queryset.filter(category=data['category'])
-            if data.get('transaction_type'):
-                queryset = queryset.filter(transaction_type=data['transaction_type'])
+        # Read once for both forms; it queries the category versions, and the rows on a miss
+        categories = await sync_to_async(categories_for)(user)
+        filter_form = TransactionFilterForm(request.GET or None, user=user, categories=categories)
+        bulk_form = TransactionBulkForm(user=user, categories=categories)
+        if filter_form.is_valid():
+            queryset = filter_form.filter_queryset(queryset)
+            filters = filter_form.cleaned_data
         
-        return queryset
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['filter_form'] = TransactionFilterForm(self.request.GET or None, user=self.request.user)
-        return context
+        count_estimate = None
+        if self.show_estimated_count:
+            count_estimate = partial(
+                rollups.aestimate_count, user,
+                start_date=filters.get('start_date'),
+                end_date=filters.get('end_date'),
+                category=filters.get('category'),
+                transaction_type=filters.get('transaction_type'),
+            )
+        paginator = CursorPaginator(queryset, self.paginate_by, count_estimate=count_estimate)
+        page = await paginator.aget_page(request.GET.get('cursor'))
+        
+        return render(request, self.template_name, {
+            'filter_form': filter_form,
+            'bulk_form': bulk_form,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'transactions': page.object_list,
+        })
 
 class TransactionDetailView(LoginRequiredMixin, DetailView):
     model = Transaction
     
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
+        return Transaction.objects.for_user(self.request.user)
 
 class TransactionCreateView(LoginRequiredMixin, CreateView):
     model = Transaction
@@ -194,7 +201,7 @@ class TransactionUpdateView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('transaction-list')
     
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
+        return Transaction.objects.for_user(self.request.user)
     
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -206,7 +213,7 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('transaction-list')
     
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
+        return Transaction.objects.for_user(self.request.user)
 
 # Category Views
 class CategoryListView(LoginRequiredMixin, ListView):
@@ -248,7 +255,13 @@ class BudgetListView(LoginRequiredMixin, ListView):
     context_object_name = 'budgets'
     
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user).order_by('-start_date')
+        return Budget.objects.for_user(self.request.user).for_list().order_by('-start_date')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        for budget in context['budgets']:
+            budget.progress = budget_progress(budget)
+        return context
 
 class BudgetCreateView(LoginRequiredMixin, CreateView):
     model = Budget
@@ -270,7 +283,7 @@ class BudgetUpdateView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('budget-list')
     
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user)
+        return Budget.objects.for_user(self.request.user)
     
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -282,102 +295,115 @@ class BudgetDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('budget-list')
     
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user)
+        return Budget.objects.for_user(self.request.user)
 
 
 # Export Data
 @login_required
-def export_transactions(request):
-    transactions = Transaction.objects.filter(user=request.user).order_by('-date')
-    
-    # Create DataFrame
-    df = pd.DataFrame.from_records(transactions.values(
-        'date', 'amount', 'transaction_type', 'category__name', 'description'
-    ))
-    
-    # Rename columns
-    df = df.rename(columns={
-        'date': 'Date',
-        'amount': 'Amount',
-        'transaction_type': 'Type',
-        'category__name': 'Category',
-        'description': 'Description'
+@watermarks.conditional_page()
+async def export_transactions(request):
+    user = await _request_user(request)
+    transactions = Transaction.objects.for_user(user).order_by('-date')
+    
+    # Same filters as the transaction list
+    form = await sync_to_async(TransactionFilterForm)(request.GET, user=user)
+    if form.is_valid():
+        transactions = form.filter_queryset(transactions)
+    
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.FORMATS:
+        return HttpResponseBadRequest('Unsupported export format.')
+    
+    return exports.streaming_export(
+        transactions, export_format, compress=request.GET.get('gzip') == '1',
+        asynchronous=isinstance(request, ASGIRequest),
+    )
+
+# Import
+@login_required
+def import_transactions(request):
+    form = TransactionImportForm(request.POST or None, request.FILES or None)
+    result = None
+    if request.method == 'POST' and form.is_valid():
+        upload = form.cleaned_data['file']
+        file_format = form.cleaned_data['file_format']
+        if file_format == 'auto':
+            file_format = imports.detect_format(upload.name)
+        result = imports.import_file(
+            request.user, upload.file, file_format, create_categories=form.cleaned_data['create_categories']
+        )
+        messages.success(request, f'Imported {result.imported} transactions.')
+        if result.failed:
+            messages.warning(request, f'{result.failed} rows were skipped because they are invalid.')
+    
+    return render(request, 'expenses/transaction_import.html', {
+        'form': form,
+        'result': result,
+        'errors': result.errors[:100] if result else [],
     })
-    
-    # Map transaction types
-    df['Type'] = df['Type'].map({'IN': 'Income', 'EX': 'Expense'})
-    
-    # Create response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
-    
-    # Write DataFrame to CSV
-    df.to_csv(response, index=False)
-    
-    return response
+
+@login_required
+@require_POST
+def bulk_transactions(request):
+    """Apply a bulk action from the transaction list, then return to it with the same filters.
+
+    The list filters arrive in the query string, so "all matching" acts on
+    exactly the rows the list shows.
+    """
+    list_url = reverse('transaction-list')
+    if request.GET:
+        list_url = f'{list_url}?{request.GET.urlencode()}'
+    categories = categories_for(request.user)
+    form = TransactionBulkForm(request.POST, user=request.user, categories=categories)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, ' '.join(errors))
+        return redirect(list_url)
+    
+    data = form.cleaned_data
+    queryset = Transaction.objects.for_user(request.user)
+    if data['scope'] == TransactionBulkForm.SELECTED:
+        queryset = queryset.filter(pk__in=data['selected'])
+    else:
+        filter_form = TransactionFilterForm(request.GET, user=request.user, categories=categories)
+        if not filter_form.is_valid():
+            messages.error(request, 'The filters are invalid; nothing was changed.')
+            return redirect(list_url)
+        queryset = filter_form.filter_queryset(queryset)
+    
+    changed = bulk.apply(
+        queryset, data['action'], category=data['category'], transaction_type=data['transaction_type'],
+        recurrence_frequency=data['recurrence_frequency'],
+    )
+    verb = 'Deleted' if data['action'] == bulk.DELETE else 'Updated'
+    messages.success(request, f'{verb} {changed} transactions.')
+    return redirect(list_url)
 
 # Recurring Transactions
 @login_required
 def process_recurring_transactions(request):
-    today = timezone.now().date()
-    recurring_transactions = Transaction.objects.filter(
-        user=request.user,
-        recurring=True,
-        next_recurrence_date__lte=today
-    )
-    
-    created_count = 0
-    
-    for transaction in recurring_transactions:
-        # Create new transaction
-        new_transaction = Transaction.objects.create(
-            user=request.user,
-            amount=transaction.amount,
-            category=transaction.category,
-            date=today,
-            description=transaction.description,
-            transaction_type=transaction.transaction_type,
-            recurring=True,
-            recurrence_frequency=transaction.recurrence_frequency
-        )
-        
-        # Update next recurrence date
-        if transaction.recurrence_frequency == 'daily':
-            transaction.next_recurrence_date = today + timedelta(days=1)
-        elif transaction.recurrence_frequency == 'weekly':
-            transaction.next_recurrence_date = today + timedelta(weeks=1)
-        elif transaction.recurrence_frequency == 'monthly':
-            transaction.next_recurrence_date = today + timedelta(days=30)
-        elif transaction.recurrence_frequency == 'yearly':
-            transaction.next_recurrence_date = today + timedelta(days=365)
-        
-        transaction.save()
-        created_count += 1
-    
-    messages.success(request, f'Processed {created_count} recurring transactions.')
+    result = recurring.process_due(user=request.user)
+    messages.success(request, f'Processed {result.created} recurring transactions.')
     return redirect('dashboard')
 
 # Search Functionality
 @login_required
-def search_transactions(request):
+async def search_transactions(request):
+    user = await _request_user(request)
     query = request.GET.get('q', '')
     
     if query:
-        transactions = Transaction.objects.filter(
-            Q(user=request.user) &
-            (Q(description__icontains=query) |
-             Q(category__name__icontains=query) |
-             Q(amount__icontains=query))
-        ).order_by('-date')
+        # Picking the backend introspects the database on first use
+        transactions, ordering = await sync_to_async(search.search_transactions)(user, query)
     else:
-        transactions = Transaction.objects.none()
+        transactions, ordering = Transaction.objects.none(), ('-date', '-id')
     
-    paginator = Paginator(transactions, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(transactions, 10, ordering=ordering)
+    page_obj = await paginator.aget_page(request.GET.get('cursor'))
     
     return render(request, 'expenses/search_results.html', {
         'transactions': page_obj,
+        'page_obj': page_obj,
         'query': query
     })
 
@@ -390,6 +416,7 @@ def custom_logout(request):
 
 
 @login_required
+@watermarks.conditional_page(_today)
 def reports(request):
     today = timezone.now().date()
     start_date = today.replace(day=1)
@@ -399,177 +426,125 @@ def reports(request):
         start_date = datetime.strptime(request.POST.get('start_date'), '%Y-%m-%d').date()
         end_date = datetime.strptime(request.POST.get('end_date'), '%Y-%m-%d').date()
     
-    # Get transactions in date range
-    transactions = Transaction.objects.filter(
-        user=request.user,
-        date__range=[start_date, end_date]
-    ).order_by('date')
-    
-    # Prepare data for charts - ensure all required fields are included
-    df = pd.DataFrame.from_records(transactions.values(
-        'date', 'amount', 'transaction_type', 'category__name'
-    ))
+    context = report_cache.get_or_build(
+        request.user, start_date, end_date, lambda: build_report(request.user, start_date, end_date)
+    )
+    return render(request, 'expenses/reports.html', context)
+
+
+@login_required
+def report_chart(request, chart_id):
+    etag = f'"{chart_id}"'
+    # Chart ids are content hashes, so a matching ETag is always still valid
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    png = charts.get_chart(chart_id, request.user.pk)
+    if png is None:
+        raise Http404('Chart not found')
+    if png is charts.PENDING:
+        response = HttpResponse(status=202)
+        response['Retry-After'] = '1'
+        return response
+
+    response = HttpResponse(png, content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+
+@login_required
+def report_data_view(request, series):
+    if series not in report_data.SERIES:
+        raise Http404('Unknown report series')
+    try:
+        start_date = date.fromisoformat(request.GET['start'])
+        end_date = date.fromisoformat(request.GET['end'])
+        points = min(max(int(request.GET.get('points', report_data.DEFAULT_POINTS)), 1), report_data.MAX_POINTS)
+    except (KeyError, ValueError):
+        return HttpResponseBadRequest('start and end must be ISO dates and points a number.')
+    if start_date > end_date:
+        return HttpResponseBadRequest('start must not be after end.')
+    
+    data = report_cache.get_or_build(
+        request.user, start_date, end_date,
+        lambda: report_data.summary(request.user, start_date, end_date, points),
+        name=f'summary:{points}',
+    )
+    return JsonResponse(data[series])
+
+
+@login_required
+def forecast_view(request):
+    """Spending trend and this month's projection; the dashboard widget loads it."""
+    return JsonResponse(forecasts.forecast(request.user, timezone.now().date()))
+
+
+@staff_member_required
+def report_cache_stats(request):
+    return JsonResponse(report_cache.stats())
+
+
+@staff_member_required
+def performance_stats(request):
+    """Request timings per URL name collected by PerformanceMiddleware in this process."""
+    if request.method == 'POST':
+        profiling.reset()
+        return redirect('performance-stats')
+    stats = profiling.snapshot()
+    if request.GET.get('format') == 'json':
+        return JsonResponse(stats)
+    return render(request, 'expenses/performance_stats.html', {
+        'stats': stats,
+        'enabled': settings.EXPENSES_PERF,
+    })
+
+
+def build_report(user, start_date, end_date):
+    """Compute the reports page context; it is cached per data version by report_cache.
     
-    # Handle empty DataFrame case
-    if df.empty:
+    Interactive charts load their series from report_data_view in the browser.
+    """
+    if not Transaction.objects.for_user(user).filter(date__range=[start_date, end_date]).exists():
         context = {
             'start_date': start_date,
             'end_date': end_date,
-            'time_series_chart': None,
-            'category_pie': None,
             'monthly_expenses_chart': None,
             'category_expenses_chart': None,
             'no_data': True
         }
-        return render(request, 'expenses/reports.html', context)
+        return context
     
-    # Ensure transaction_type exists before processing
-    if 'transaction_type' not in df.columns:
-        df['transaction_type'] = 'EX'  # Default to expense if missing
+    series = report_data.summary(user, start_date, end_date)
+    monthly_data = series['monthly']
+    category_data = series['categories']
     
-    # ========== PLOTLY CHARTS (Existing) ==========
-    
-    # Income vs Expense over time (line chart)
-    try:
-        df['date'] = pd.to_datetime(df['date'])
-        time_series = df.groupby(['date', 'transaction_type'])['amount'].sum().unstack().fillna(0)
-        time_series_chart = px.line(
-            time_series.reset_index(), 
-            x='date', 
-            y=['IN', 'EX'],
-            labels={'value': 'Amount', 'variable': 'Type', 'date': 'Date'},
-            title='Income vs Expenses Over Time'
-        ) if 'IN' in time_series.columns and 'EX' in time_series.columns else None
-    except Exception as e:
-        time_series_chart = None
-    
-    # Expense by category (pie chart)
-    try:
-        expenses_df = df[df['transaction_type'] == 'EX'] if 'transaction_type' in df.columns else pd.DataFrame()
-        category_pie = px.pie(
-            expenses_df,
-            values='amount',
-            names='category__name',
-            title='Expenses by Category'
-        ) if not expenses_df.empty else None
-    except Exception as e:
-        category_pie = None
-    
-    # ========== MATPLOTLIB CHARTS (New) ==========
+    # ========== MATPLOTLIB CHARTS (rendered by the chart pool) ==========
     
     # Monthly Expenses Bar Chart
-    try:
-        # Create monthly data
-        monthly_data = transactions.extra({
-            'month': "EXTRACT(month FROM date)",
-            'year': "EXTRACT(year FROM date)"
-        }).values('year', 'month').annotate(
-            income=Sum('amount', filter=Q(transaction_type='IN')),
-            expenses=Sum('amount', filter=Q(transaction_type='EX'))
-        ).order_by('year', 'month')
-        
-        if monthly_data:
-            months = []
-            income_data = []
-            expenses_data = []
-            
-            for data in monthly_data:
-                month_year = f"{int(data['month'])}/{int(data['year'])}"
-                months.append(month_year)
-                income_data.append(float(data['income'] or 0))
-                expenses_data.append(float(data['expenses'] or 0))
-            
-            # Create matplotlib bar chart
-            plt.figure(figsize=(12, 6))
-            x = range(len(months))
-            width = 0.35
-            
-            plt.bar([i - width/2 for i in x], income_data, width, label='Income', color='#28a745', alpha=0.8)
-            plt.bar([i + width/2 for i in x], expenses_data, width, label='Expenses', color='#dc3545', alpha=0.8)
-            
-            plt.title('Monthly Income vs Expenses', fontsize=16, fontweight='bold', pad=20)
-            plt.xlabel('Month', fontsize=12)
-            plt.ylabel('Amount ($)', fontsize=12)
-            plt.xticks(x, months, rotation=45)
-            plt.legend()
-            plt.grid(axis='y', alpha=0.3)
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-            buffer.seek(0)
-            monthly_expenses_chart = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            buffer.close()
-            plt.close()
-        else:
-            monthly_expenses_chart = None
-            
-    except Exception as e:
-        monthly_expenses_chart = None
+    monthly_expenses_chart = charts.request_chart(user.pk, 'monthly', {
+        'labels': [f"{int(label[5:])}/{label[:4]}" for label in monthly_data['labels']],
+        'income': monthly_data['income'],
+        'expenses': monthly_data['expenses'],
+    }) if monthly_data['labels'] else None
     
     # Category Expenses Pie Chart
-    try:
-        category_data = transactions.filter(transaction_type='EX').values(
-            'category__name'
-        ).annotate(total=Sum('amount')).order_by('-total')
-        
-        if category_data:
-            categories = []
-            amounts = []
-            
-            for data in category_data:
-                categories.append(data['category__name'] or 'Uncategorized')
-                amounts.append(float(data['total']))
-            
-            # Create matplotlib pie chart
-            plt.figure(figsize=(10, 8))
-            
-            # Use a color palette
-            colors = plt.cm.Set3(range(len(categories)))
-            
-            wedges, texts, autotexts = plt.pie(
-                amounts, 
-                labels=categories, 
-                colors=colors,
-                autopct='%1.1f%%',
-                startangle=90,
-                textprops={'fontsize': 10}
-            )
-            
-            # Improve text appearance
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-            
-            plt.title('Expenses by Category', fontsize=16, fontweight='bold', pad=20)
-            plt.axis('equal')
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-            buffer.seek(0)
-            category_expenses_chart = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            buffer.close()
-            plt.close()
-        else:
-            category_expenses_chart = None
-            
-    except Exception as e:
-        category_expenses_chart = None
+    category_expenses_chart = charts.request_chart(user.pk, 'category', {
+        'labels': category_data['labels'],
+        'amounts': category_data['totals'],
+    }) if category_data['labels'] else None
     
     context = {
         'start_date': start_date,
         'end_date': end_date,
-        'time_series_chart': time_series_chart,
-        'category_pie': category_pie,
         'monthly_expenses_chart': monthly_expenses_chart,
         'category_expenses_chart': category_expenses_chart,
+        'interactive_series': list(report_data.SERIES),
         'no_data': False
     }
     
-    return render(request, 'expenses/reports.html', context)
+    return context
 
 @login_required
 def about(request):
@@ -0,0 +1,127 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import F, Max, Q, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import DataWatermark
+
+# Last-Modified has one-second resolution, so it is only sent once the
+# watermark is older than that; the ETag alone covers newer changes
+LAST_MODIFIED_MIN_AGE = timedelta(seconds=1)
+
+
+def touch(user_ids, categories=False):
+    """Advance the watermarks of ``user_ids``; ``None`` advances everyone's.
+
+    With ``categories`` their category versions advance too.
+    """
+    now = timezone.now()
+    changes = {'version': F('version') + 1, 'modified_at': now}
+    if categories:
+        changes['categories_version'] = F('categories_version') + 1
+    # A fixed order, so concurrent writers lock the rows the same way round
+    for user_id in sorted(set(user_ids), key=lambda user_id: user_id or 0):
+        rows = DataWatermark.objects.filter(user_id=user_id)
+        if rows.update(**changes):
+            continue
+        _, created = DataWatermark.objects.get_or_create(
+            user_id=user_id, defaults={'version': 1, 'modified_at': now, 'categories_version': int(categories)}
+        )
+        if not created:
+            rows.update(**changes)
+
+
+def _watermarks(user_id):
+    return DataWatermark.objects.filter(Q(user_id=user_id) | Q(user_id=None)).order_by()
+
+
+def state(user_id):
+    """``(version, modified_at)`` of everything the user's pages show, in one query.
+
+    Versions only grow, so their sum changes whenever either row does.
+    """
+    row = _watermarks(user_id).aggregate(version=Sum('version'), modified_at=Max('modified_at'))
+    return row['version'] or 0, row['modified_at']
+
+
+def category_versions(user_id):
+    """``(defaults, own)``: the category versions of the default categories and of the user's own."""
+    versions = dict(_watermarks(user_id).values_list('user_id', 'categories_version'))
+    return versions.get(None, 0), versions.get(user_id, 0)
+
+
+async def astate(user_id):
+    row = await _watermarks(user_id).aaggregate(version=Sum('version'), modified_at=Max('modified_at'))
+    return row['version'] or 0, row['modified_at']
+
+
+def _applies(request):
+    # A page with pending messages must be rendered to show (and consume) them
+    return request.method in ('GET', 'HEAD') and not len(messages.get_messages(request))
+
+
+def _validators(request, user_id, watermark, inputs):
+    version, modified_at = watermark
+    parts = [
+        getattr(settings, 'EXPENSES_RELEASE', ''), user_id, version, request.get_full_path(),
+        # Forms on the page carry a token for this CSRF secret
+        request.META.get('CSRF_COOKIE', ''),
+        *(value(request) for value in inputs),
+    ]
+    etag = '"%s"' % hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    last_modified = None
+    if modified_at is not None and timezone.now() - modified_at >= LAST_MODIFIED_MIN_AGE:
+        last_modified = int(modified_at.timestamp())
+    return etag, last_modified
+
+
+def _finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        if last_modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+        # Cache privately, but ask every time whether the copy is still current
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(*inputs):
+    """Answer conditional GETs of a login-protected per-user page from the watermark alone.
+
+    The ETag covers the user's watermark, the full path and ``inputs``,
+    functions of the request returning anything else the page depends on
+    (such as today's date). A matching ``If-None-Match`` or
+    ``If-Modified-Since`` gets a 304 without running the view. Works on
+    sync and async views; apply it inside ``login_required``.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                if not _applies(request):
+                    return await view(request, *args, **kwargs)
+                user = await request.auser()
+                etag, last_modified = _validators(request, user.pk, await astate(user.pk), inputs)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                if not _applies(request):
+                    return view(request, *args, **kwargs)
+                etag, last_modified = _validators(request, request.user.pk, state(request.user.pk), inputs)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+        return wrapper
+    return decorator